@@ -0,0 +1,216 @@
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from agents import function_tool, custom_span, trace, RunContextWrapper, OpenAIChatCompletionsModel
+from agents.tool_context import ToolContext
+from openai import AsyncOpenAI
+
+# ✅ Gemini client setup
+client = AsyncOpenAI(
+    api_key="your-gemini-api-key",
+    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+)
+
+# ✅ Gemini model
+model = OpenAIChatCompletionsModel(
+    model="gemini-2.5-flash",
+    openai_client=client
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the tool while its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Per-tool circuit breaker: closed -> open -> half-open -> closed.
+
+    Closed: calls go through; outcomes from the last `window_seconds` are
+    kept, and once at least `min_calls` are in and the failure rate reaches
+    `failure_rate` the breaker opens. Open: calls fail at once with
+    `CircuitOpenError`, which `failure_error_function` turns into the
+    tool's fallback answer, so no run waits on a dead dependency. After
+    `open_seconds` one trial call is let through (half-open): success closes
+    the breaker, failure opens it again. Exceptions listed in `ignore` (e.g.
+    "unknown user") are the caller's problem, not the dependency's, and do
+    not count as failures. State changes are recorded as `custom_span`s in
+    the current trace and in `metrics()`. Apply it under `@function_tool`.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_rate: float = 0.5, min_calls: int = 5, window_seconds: float = 30.0,
+                 open_seconds: float = 15.0, ignore: tuple = ()):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.ignore = ignore
+        self.state = self.CLOSED
+        self._outcomes = deque()  # (timestamp, failed)
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()  # sync tools may run on worker threads
+        self.calls = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.times_opened = 0
+        self.transitions = deque(maxlen=100)  # most recent (timestamp, event) pairs
+
+    def _current_failure_rate(self, now: float) -> float:
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+        if len(self._outcomes) < self.min_calls:
+            return 0.0
+        return sum(failed for _, failed in self._outcomes) / len(self._outcomes)
+
+    def _transition(self, state: str, now: float, reason: str) -> None:
+        event = {"tool": self.name, "from": self.state, "to": state, "reason": reason}
+        self.state = state
+        self.transitions.append((now, event))
+        if state == self.OPEN:
+            self._opened_at = now
+            self.times_opened += 1
+        elif state == self.CLOSED:
+            self._outcomes.clear()
+        with custom_span(f"circuit_breaker.{state}", data=event):
+            pass
+
+    def _before_call(self) -> bool:
+        """Returns True if this call is the half-open trial."""
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            if self.state == self.OPEN and now - self._opened_at >= self.open_seconds:
+                self._transition(self.HALF_OPEN, now, f"{self.open_seconds:g}s cool-down elapsed")
+            if self.state == self.CLOSED:
+                return False
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.short_circuited += 1
+        raise CircuitOpenError(f"{self.name} is unavailable (circuit {self.state}); not calling it")
+
+    def _after_call(self, trial: bool, error: Exception | None) -> None:
+        failed = error is not None and not isinstance(error, self.ignore)
+        now = time.monotonic()
+        with self._lock:
+            self.failures += failed
+            if trial:
+                self._trial_running = False
+                if failed:
+                    self._transition(self.OPEN, now, f"trial call failed: {error!r}")
+                else:
+                    self._transition(self.CLOSED, now, "trial call succeeded")
+                return
+            if self.state != self.CLOSED:
+                return
+            self._outcomes.append((now, failed))
+            rate = self._current_failure_rate(now)
+            if failed and rate >= self.failure_rate:
+                self._transition(self.OPEN, now, f"failure rate {rate:.0%} over {len(self._outcomes)} calls")
+
+    def _abandon(self, trial: bool) -> None:
+        # Cancelled (or interrupted) calls say nothing about the dependency:
+        # no outcome is recorded, but a trial hands its slot to the next call.
+        if trial:
+            with self._lock:
+                self._trial_running = False
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def guarded(*args, **kwargs):
+                trial = self._before_call()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as exc:
+                    self._after_call(trial, exc)
+                    raise
+                except BaseException:
+                    self._abandon(trial)
+                    raise
+                self._after_call(trial, None)
+                return result
+        else:
+            @functools.wraps(func)
+            def guarded(*args, **kwargs):
+                trial = self._before_call()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as exc:
+                    self._after_call(trial, exc)
+                    raise
+                except BaseException:
+                    self._abandon(trial)
+                    raise
+                self._after_call(trial, None)
+                return result
+        return guarded
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "calls": self.calls,
+                "failures": self.failures,
+                "short_circuited": self.short_circuited,
+                "times_opened": self.times_opened,
+                "window_failure_rate": round(self._current_failure_rate(time.monotonic()), 2),
+            }
+
+
+def my_custom_error_function(context: RunContextWrapper[Any], error: Exception) -> str:
+    """A custom function to provide a user-friendly error message."""
+    if isinstance(error, CircuitOpenError):
+        return "The profile service is down. Don't retry now; tell the user to try again in a few minutes."
+    print(f"A tool call failed with the following error: {error}")
+    return "An internal server error occurred. Please try again later."
+
+
+profile_breaker = CircuitBreaker("get_user_profile", min_calls=3, open_seconds=2.0, ignore=(ValueError,))
+PROFILE_SERVICE_UP = True
+
+
+@function_tool(failure_error_function=my_custom_error_function)
+@profile_breaker
+async def get_user_profile(user_id: str) -> str:
+    """Fetches a user profile from a mock API.
+     This function demonstrates a 'flaky' or failing API call.
+    """
+    if not PROFILE_SERVICE_UP:
+        await asyncio.sleep(0.5)  # the request hangs until it times out
+        raise ConnectionError("profile service timed out")
+    if user_id == "user_123":
+        return "User profile for user_123 successfully retrieved."
+    else:
+        raise ValueError(f"Could not retrieve profile for user_id: {user_id}. API returned an error.")
+
+
+# Usage: the profile service goes down, the breaker opens, then it recovers
+async def main():
+    global PROFILE_SERVICE_UP
+    with trace("circuit breaker demo"):
+        for phase, service_up, calls in (("healthy", True, 3), ("outage", False, 8), ("recovered", True, 3)):
+            PROFILE_SERVICE_UP = service_up
+            if phase == "recovered":
+                await asyncio.sleep(profile_breaker.open_seconds)  # wait out the cool-down
+            for n in range(calls):
+                arguments = '{"user_id": "user_123"}'
+                context = ToolContext(context=None, tool_name=get_user_profile.name,
+                                      tool_call_id=f"call_{phase}_{n}", tool_arguments=arguments)
+                start = time.perf_counter()
+                await get_user_profile.on_invoke_tool(context, arguments)
+                print(f"{phase:>9}: {(time.perf_counter() - start) * 1e3:6.1f} ms, breaker {profile_breaker.state}")
+    for _, event in profile_breaker.transitions:
+        print("transition:", event)
+    print(profile_breaker.metrics())
+
+if __name__ == "__main__":
+    asyncio.run(main())
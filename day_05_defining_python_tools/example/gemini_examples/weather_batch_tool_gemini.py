@@ -0,0 +1,47 @@
+import asyncio
+from agents import Agent, Runner, function_tool, OpenAIChatCompletionsModel
+from openai import AsyncOpenAI
+
+# ✅ Gemini client setup
+client = AsyncOpenAI(
+    api_key="your-gemini-api-key",
+    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+)
+
+# ✅ Gemini model
+model = OpenAIChatCompletionsModel(
+    model="gemini-2.5-flash",
+    openai_client=client
+)
+
+@function_tool
+def get_weather(cities: list[str]) -> dict[str, str]:
+    """Return a short weather summary for each of the given cities (mock).
+
+    Args:
+        cities: One or more city names, e.g. ["London", "Tokyo"].
+
+    Returns:
+        City -> weather summary; "n/a" for cities without data.
+    """
+    # One call (and, with a real API, one bulk request) instead of one per city
+    weather_db = {
+        "London": "sunny, 20°C",
+        "New York": "cloudy, 15°C",
+        "Tokyo": "rainy, 18°C",
+    }
+    return {city: weather_db.get(city, "n/a") for city in dict.fromkeys(cities)}
+
+agent = Agent(
+    name="WeatherBuddy",
+    instructions="Use the get_weather tool for live weather queries. Ask for all cities in a single call.",
+    tools=[get_weather],
+    model=model
+)
+
+async def main():
+    result = await Runner.run(agent, "Compare the weather in London, New York and Tokyo.")
+    print(result.final_output)
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+import asyncio
+import functools
+import hashlib
+import importlib
+import inspect
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from pathlib import Path
+
+import agents
+from agents.tool_context import ToolContext
+
+
+class ToolExecutors:
+    """Named, bounded executors that sync tools run on, with queue-depth metrics.
+
+    "thread" suits blocking I/O (HTTP, sqlite3, files); "process" suits
+    CPU-heavy pure functions, which must be defined at module level of an
+    importable module or script. Extra executors can be registered under
+    any name.
+    """
+
+    def __init__(self, threads: int = 8, processes: int = 2):
+        self._factories = {
+            "thread": lambda: ThreadPoolExecutor(threads, thread_name_prefix="tool"),
+            "process": lambda: ProcessPoolExecutor(processes),
+        }
+        self._workers = {"thread": threads, "process": processes}
+        self._executors: dict[str, Executor] = {}
+        self._stats: dict[str, dict] = {}
+
+    def register(self, name: str, executor: Executor, workers: int) -> None:
+        self._executors[name] = executor
+        self._workers[name] = workers
+
+    def get(self, name: str) -> Executor:
+        executor = self._executors.get(name)
+        if executor is None:
+            executor = self._executors[name] = self._factories[name]()  # created on first use
+        return executor
+
+    async def run(self, name: str, func, *args, **kwargs):
+        stats = self._stats.setdefault(name, {"submitted": 0, "in_flight": 0, "peak_queue_depth": 0,
+                                              "total_seconds": 0.0})
+        stats["submitted"] += 1
+        stats["in_flight"] += 1
+        stats["peak_queue_depth"] = max(stats["peak_queue_depth"], stats["in_flight"] - self._workers[name])
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.get(name), functools.partial(func, *args, **kwargs))
+        finally:
+            stats["in_flight"] -= 1
+            stats["total_seconds"] += time.perf_counter() - start
+
+    def metrics(self) -> dict:
+        return {
+            name: {**stats, "workers": self._workers[name],
+                   "queue_depth": max(0, stats["in_flight"] - self._workers[name])}
+            for name, stats in self._stats.items()
+        }
+
+    def shutdown(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+
+
+default_executors = ToolExecutors()
+
+# Process workers cannot unpickle a decorated function (its module name now
+# refers to the FunctionTool), so they import the tool's module and call the
+# original kept on the tool. The module must be importable by name: under the
+# spawn/forkserver start methods a worker shares nothing with the parent.
+def _importable_name(f) -> str:
+    module = f.__module__
+    if module == "__main__":
+        main = sys.modules["__main__"]
+        spec = getattr(main, "__spec__", None)
+        if spec is not None and spec.name:
+            module = spec.name  # python -m package.module
+        elif getattr(main, "__file__", None):
+            module = Path(main.__file__).stem  # a script; its directory is on sys.path
+        else:
+            raise ValueError(f"{f.__qualname__} is not importable; it cannot run in a process pool")
+    if "<locals>" in f.__qualname__:
+        raise ValueError(f"{f.__qualname__} is not defined at module level; it cannot run in a process pool")
+    return f"{module}:{f.__qualname__}"
+
+
+def _call_original(ref: str, args: tuple, kwargs: dict):
+    module_name, _, qualname = ref.partition(":")
+    tool = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        tool = getattr(tool, name)
+    return tool.original_function(*args, **kwargs)
+
+
+def function_tool(func=None, *, executor: str | None = "thread", executors: ToolExecutors = default_executors,
+                  **kwargs):
+    """`agents.function_tool` that runs plain `def` tools off the event loop.
+
+    Older SDK releases call a sync tool directly on the event loop; newer
+    ones use `asyncio.to_thread`, i.e. the process-wide default executor
+    (min(32, CPUs + 4) threads) with no per-tool control or metrics.
+
+    Sync tools run on `executors`' "thread" pool by default; pass
+    `executor="process"` (or any registered name) per tool, or `executor=None`
+    to leave a trivial tool to the SDK's default handling. Async tools are
+    passed through unchanged.
+    Other keyword arguments go to `agents.function_tool`.
+    """
+    def decorate(f):
+        if executor is None or inspect.iscoroutinefunction(f):
+            return agents.function_tool(f, **kwargs)
+        if executor == "process":
+            ref = _importable_name(f)
+
+            @functools.wraps(f)
+            async def offloaded(*args, **kw):
+                return await executors.run(executor, _call_original, ref, args, kw)
+        else:
+            @functools.wraps(f)
+            async def offloaded(*args, **kw):
+                return await executors.run(executor, f, *args, **kw)
+
+        tool = agents.function_tool(offloaded, **kwargs)
+        tool.original_function = f  # looked up by process workers
+        return tool
+
+    return decorate(func) if func is not None else decorate
+
+
+@function_tool
+def get_weather(city: str) -> str:
+    """Return a short, human-readable weather summary for the given city (mock)."""
+    time.sleep(0.2)  # a blocking HTTP call in a real tool
+    weather_db = {
+        "London": "sunny, 20°C",
+        "New York": "cloudy, 15°C",
+        "Tokyo": "rainy, 18°C",
+    }
+    return weather_db.get(city, "I don't have weather data for that city.")
+
+
+@function_tool(executor="process")
+def file_checksum(text: str) -> str:
+    """Return a slow, CPU-bound checksum of the text."""
+    digest = text.encode()
+    for _ in range(200_000):
+        digest = hashlib.sha256(digest).digest()
+    return digest.hex()[:16]
+
+
+@agents.function_tool
+def get_weather_plain(city: str) -> str:
+    """The same weather tool under plain `@function_tool`."""
+    time.sleep(0.2)
+    return "sunny, 20°C"
+
+
+# Usage: 20 concurrent runs each calling a blocking tool, plus CPU-bound tools in processes
+async def main():
+    # Tools are invoked as the Runner does, with a ToolContext, just without a model.
+    calls = {
+        "plain": [(get_weather_plain, '{"city": "London"}')] * 20,
+        "offloaded": [(get_weather, '{"city": "London"}')] * 20,
+        "process": [(file_checksum, f'{{"text": "doc {n}"}}') for n in range(4)],
+    }
+    for name, batch in calls.items():
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            tool.on_invoke_tool(ToolContext(context=None, tool_name=tool.name, tool_call_id=f"call_{n}",
+                                            tool_arguments=arguments), arguments)
+            for n, (tool, arguments) in enumerate(batch)
+        ))
+        what = "checksums" if name == "process" else "blocking weather calls"
+        print(f"{name:>9}: {len(batch)} {what} in {time.perf_counter() - start:.2f} s")
+    print(default_executors.metrics())
+    default_executors.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
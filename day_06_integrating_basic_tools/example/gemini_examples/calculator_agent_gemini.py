@@ -1,5 +1,5 @@
 from agents import Agent, Runner, OpenAIChatCompletionsModel
-from agents.tools import function_tool
+from schema_cache import cached_function_tool as function_tool  # schema read from disk after the first run
 from openai import AsyncOpenAI
 import os
 
@@ -0,0 +1,187 @@
+import atexit
+import dataclasses
+import hashlib
+import json
+import marshal
+import os
+import sys
+import typing
+from importlib import metadata
+
+import agents
+from pydantic import TypeAdapter
+
+# Keyword arguments that change the generated schema; anything else bypasses the cache.
+SCHEMA_OPTIONS = ("name_override", "description_override", "docstring_style", "use_docstring_info", "strict_mode")
+
+
+def _sdk_version() -> str:
+    try:
+        return metadata.version("openai-agents")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _referenced_types(annotation, found: set) -> None:
+    if isinstance(annotation, type) and annotation.__module__ != "builtins":
+        found.add(annotation)
+    for arg in typing.get_args(annotation):
+        _referenced_types(arg, found)
+
+
+_type_schemas: dict[type, str] = {}
+
+
+def _type_schema(tp: type) -> str:
+    """JSON schema of a model/TypedDict/dataclass/enum the tool refers to, once per process."""
+    schema = _type_schemas.get(tp)
+    if schema is None:
+        try:
+            schema = json.dumps(TypeAdapter(tp).json_schema(), sort_keys=True)
+        except Exception:  # not a schema type; its name and fields are the best we have
+            schema = f"{tp.__module__}.{tp.__qualname__}:{getattr(tp, '__annotations__', None)!r}"
+        _type_schemas[tp] = schema
+    return schema
+
+
+class SchemaCache:
+    """On-disk cache of `@function_tool` schemas, keyed on a hash of each function's compiled source.
+
+    Building a tool introspects the signature, parses the docstring and
+    builds a pydantic model, about a millisecond per tool; with hundreds of
+    tools that dominates start-up. On a hit only the name, description and
+    JSON schema are read back, and the real tool is built on its first call.
+    The key covers the function's bytecode (docstring and line numbers
+    included), annotations and defaults, the JSON schema of every model,
+    TypedDict or dataclass the annotations refer to, its options and the
+    SDK and Python versions, so an edit never serves a stale schema. Hashing the code object instead
+    of `inspect.getsource` text avoids re-tokenizing the file per tool.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.environ.get(
+            "TOOL_SCHEMA_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "agent_tool_schemas.json"))
+        self.sdk_version = _sdk_version()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        try:
+            with open(self.path) as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+        atexit.register(self.save)
+
+    def key(self, func, options: dict) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        # marshal's format is only stable within one Python version
+        digest.update(f"{sys.version_info[:2]}\0{self.sdk_version}\0{func.__module__}.{func.__qualname__}\0".encode())
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        digest.update(marshal.dumps(func.__code__))
+        digest.update(repr((func.__annotations__, func.__defaults__, func.__kwdefaults__)).encode())
+        try:
+            hints = typing.get_type_hints(func, include_extras=True)
+        except Exception:  # unresolvable string annotations; the tool build will report them
+            hints = func.__annotations__
+        types: set = set()
+        for annotation in hints.values():
+            _referenced_types(annotation, types)
+        for tp in sorted(types, key=lambda t: f"{t.__module__}.{t.__qualname__}"):
+            digest.update(_type_schema(tp).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, tool: agents.FunctionTool) -> None:
+        self._entries[key] = {
+            "name": tool.name,
+            "description": tool.description,
+            "params_json_schema": tool.params_json_schema,
+            "strict_json_schema": tool.strict_json_schema,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)  # atomic: concurrent workers never see half a file
+        self._dirty = False
+
+    def clear(self) -> None:
+        self._entries = {}
+        self._dirty = True
+
+
+default_cache = SchemaCache()
+
+_templates: dict[tuple, agents.FunctionTool] = {}
+
+
+def _tool_template(kwargs: dict) -> agents.FunctionTool:
+    """A tool built with `kwargs` around an empty function, once per set of options.
+
+    Cache hits copy it, so they carry every setting the decorator derives
+    from those options (failure handling and whatever later SDKs add)
+    without building the real tool.
+    """
+    key = tuple(sorted(kwargs.items()))
+    template = _templates.get(key)
+    if template is None:
+        def noop() -> None:
+            """No-op."""
+        template = _templates[key] = agents.function_tool(noop, **kwargs)
+    return template
+
+
+def cached_function_tool(func=None, *, cache: SchemaCache | None = None, **kwargs):
+    """`agents.function_tool` with the schema served from `cache` and the tool built lazily.
+
+    Takes the same keyword arguments; options other than the schema ones
+    (guardrails, timeouts, approval, ...) fall back to the plain decorator.
+    """
+    def decorate(f):
+        schema_cache = cache or default_cache
+        if any(name not in SCHEMA_OPTIONS + ("failure_error_function",) for name in kwargs):
+            return agents.function_tool(f, **kwargs)
+        try:
+            key = schema_cache.key(f, {k: v for k, v in kwargs.items() if k in SCHEMA_OPTIONS})
+        except (AttributeError, ValueError):  # not a plain function (e.g. a builtin or a callable object)
+            return agents.function_tool(f, **kwargs)
+
+        entry = schema_cache.get(key)
+        if entry is None:
+            tool = agents.function_tool(f, **kwargs)
+            schema_cache.put(key, tool)
+            return tool
+
+        built = None
+
+        async def invoke(context, arguments: str):
+            nonlocal built
+            if built is None:
+                built = agents.function_tool(f, **kwargs)  # first call: build the real tool
+            return await built.on_invoke_tool(context, arguments)
+
+        tool = dataclasses.replace(
+            _tool_template(kwargs),
+            name=entry["name"],
+            description=entry["description"],
+            params_json_schema=entry["params_json_schema"],
+            on_invoke_tool=invoke,
+            strict_json_schema=False,
+        )
+        # The cached schema was stored after strict normalization; don't redo it per tool.
+        tool.strict_json_schema = entry["strict_json_schema"]
+        return tool
+
+    return decorate(func) if func is not None else decorate
@@ -0,0 +1,89 @@
+"""Start-up time of a 500-tool catalog: plain @function_tool vs. the on-disk schema cache.
+
+Each measurement imports a generated module of tools in a fresh interpreter,
+so nothing is shared between runs except the cache file.
+
+    python schema_cache_bench.py --tools 500 --repeat 3
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+TOOL_TEMPLATE = '''
+@function_tool
+def lookup_{n}(record_id: str, limit: int = 10, include_archived: bool = False, scale: float = 1.0) -> str:
+    """Looks up records of kind {n} in the synthetic catalog.
+
+    Args:
+        record_id: Identifier of the record to look up.
+        limit: Maximum number of related records to return.
+        include_archived: Whether archived records are included.
+        scale: Multiplier applied to numeric fields.
+
+    Returns:
+        A short description of the matching records.
+    """
+    return f"{n}:{{record_id}}:{{limit}}:{{include_archived}}:{{scale}}"
+'''
+
+MEASURE = textwrap.dedent("""
+    import importlib, sys, time
+    sys.path[:0] = [{catalog_dir!r}, {here!r}]
+    import agents, schema_cache  # not part of the measurement
+    start = time.perf_counter()
+    catalog = importlib.import_module("tool_catalog")
+    elapsed = time.perf_counter() - start
+    schema_cache.default_cache.save()
+    print(elapsed)
+""")
+
+
+def write_catalog(directory: str, tools: int, cached: bool) -> None:
+    header = ("from schema_cache import cached_function_tool as function_tool\n" if cached
+              else "from agents import function_tool\n")
+    with open(os.path.join(directory, "tool_catalog.py"), "w") as f:
+        f.write(header)
+        for n in range(tools):
+            f.write(TOOL_TEMPLATE.format(n=n))
+
+
+def measure(catalog_dir: str, cache_path: str) -> float:
+    env = dict(os.environ, TOOL_SCHEMA_CACHE=cache_path)
+    out = subprocess.run([sys.executable, "-c", MEASURE.format(catalog_dir=catalog_dir, here=HERE)],
+                         env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main(args) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        cache_path = os.path.join(workdir, "schemas.json")
+        runs = {}
+
+        write_catalog(workdir, args.tools, cached=False)
+        runs["plain @function_tool"] = [measure(workdir, cache_path) for _ in range(args.repeat)]
+
+        write_catalog(workdir, args.tools, cached=True)
+        cold = []
+        for _ in range(args.repeat):
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            cold.append(measure(workdir, cache_path))
+        runs["cached, cold (fills cache)"] = cold
+        runs["cached, warm"] = [measure(workdir, cache_path) for _ in range(args.repeat)]
+
+        print(f"import of {args.tools} tools, median of {args.repeat} fresh interpreters:")
+        for name, times in runs.items():
+            print(f"  {name:<28} {statistics.median(times) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tools", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
@@ -1,6 +1,7 @@
 import asyncio
 from agents import Agent, Runner, function_tool, OpenAIChatCompletionsModel
 from openai import AsyncOpenAI
+from web_search_client import resolve_link, web_search  # pooled async client, shared by the day 7 examples
 
 # ✅ Gemini client setup
 client = AsyncOpenAI(
@@ -13,34 +14,6 @@ model = OpenAIChatCompletionsModel(
     model="gemini-2.5-flash",
     openai_client=client
 )
-@function_tool
-def web_search(query: str):
-    """
-    Performs a web search using Google Custom Search API.
-
-    Args:
-        query: The search query.
-    Returns:
-        List of dictionaries containing title, link, and description.
-    """
-
-    API_KEY = "GOOGLE_API_KEY"
-    CX = "Search_Engine_Id"
-    num_results = 10  # max 10 per request
-
-    url = f"https://www.googleapis.com/customsearch/v1?q={query}&key={API_KEY}&cx={CX}&num={num_results}"
-
-    response = requests.get(url)
-    data = response.json()
-
-    results = []
-    for item in data.get("items", []):
-        results.append({
-            "title": item.get("title"),
-            "link": item.get("link"),
-            "description": item.get("snippet")
-        })
-    return results  # ✅ Return a proper list
 
 @function_tool
 def user_preferences(user_id: str) -> str:
@@ -64,10 +37,11 @@ agent = Agent(
     name="CafeFinder",
     instructions=(
         "Help the user choose a coffee shop in San Francisco. "
-        "Use WebSearchTool for current weather and shop info, "
+        "Use web_search for current weather and shop info, "
+        "resolve_link when you want to give a shop's full URL, "
         "and incorporate user_preferences(user_id) for personalization."
     ),
-    tools=[web_search, user_preferences],
+    tools=[web_search, resolve_link, user_preferences],
     model=model
 )
 
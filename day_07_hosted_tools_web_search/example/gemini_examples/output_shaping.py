@@ -0,0 +1,226 @@
+import asyncio
+import base64
+import functools
+import hashlib
+import inspect
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+
+class LinkTable:
+    """Short reference ids ("LK7QF2M3A") for URLs, resolvable back to the full URL.
+
+    Long result URLs (paths, tracking parameters) are a large share of a
+    search result's tokens and are rarely needed verbatim until the answer
+    is written. The id is a 40-bit hash of the URL, so it means the same URL
+    in every process; a ref this table has not seen (or has forgotten, past
+    `max_links`) resolves to None instead of to some other search's URL. In
+    the unlikely case of two URLs sharing an id, the second is shown in full.
+
+    Refs end up in the session history, so a resumed conversation can ask
+    for one that an earlier process handed out. With `db_path` the table is
+    kept in a small SQLite table as well (call `save`/`asave` after shaping),
+    and refs missing from memory are looked up there.
+    """
+
+    def __init__(self, max_links: int = 4096, db_path: str | None = None):
+        self.max_links = max_links
+        self.db_path = db_path
+        self._urls: OrderedDict[str, str] = OrderedDict()  # id -> url
+        self._unsaved: dict[str, str] = {}  # id -> url, not yet written to db_path
+        self._db = None
+        if db_path:
+            self._db_lock = threading.Lock()
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS links "
+                             "(ref TEXT PRIMARY KEY, url TEXT NOT NULL, seen_at REAL NOT NULL)")
+            with self._db_lock:
+                rows = self._db.execute("SELECT ref, url FROM links ORDER BY seen_at DESC LIMIT ?",
+                                        (max_links,)).fetchall()
+            for ref, url in reversed(rows):
+                self._urls[ref] = url
+
+    @staticmethod
+    def ref_for(url: str) -> str:
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=5).digest()
+        return "L" + base64.b32encode(digest).decode("ascii")
+
+    def ref(self, url: str) -> str | None:
+        """The id for `url`, or None if its id is already taken by another URL."""
+        ref = self.ref_for(url)
+        known = self._urls.get(ref)
+        if known is None:
+            self._urls[ref] = url
+            while len(self._urls) > self.max_links:
+                self._urls.popitem(last=False)
+        elif known != url:
+            return None
+        else:
+            self._urls.move_to_end(ref)
+        if self._db is not None:
+            self._unsaved.pop(ref, None)
+            self._unsaved[ref] = url  # most recently used last
+        return ref
+
+    def resolve(self, ref: str) -> str | None:
+        ref = ref.strip().upper()
+        url = self._urls.get(ref)
+        if url is None and self._db is not None:
+            with self._db_lock:
+                row = self._db.execute("SELECT url FROM links WHERE ref = ?", (ref,)).fetchone()
+            url = row[0] if row else None
+        return url
+
+    def _write(self, links: dict[str, str]) -> None:
+        now = time.time()
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            # Another process may hold a different URL under the same id: keep
+            # the first one, like `ref` does in memory.
+            self._db.executemany("INSERT INTO links (ref, url, seen_at) VALUES (?, ?, ?) "
+                                 "ON CONFLICT (ref) DO UPDATE SET seen_at = excluded.seen_at "
+                                 "WHERE links.url = excluded.url",
+                                 [(ref, url, now + n * 1e-6) for n, (ref, url) in enumerate(links.items())])
+            self._db.execute("DELETE FROM links WHERE ref NOT IN "
+                             "(SELECT ref FROM links ORDER BY seen_at DESC LIMIT ?)", (self.max_links,))
+            self._db.execute("COMMIT")
+
+    def save(self) -> None:
+        """Write the refs handed out since the last save to `db_path`."""
+        links, self._unsaved = self._unsaved, {}
+        if links:
+            self._write(links)
+
+    async def asave(self) -> None:
+        """`save` with the SQLite write in a thread, off the event loop."""
+        links, self._unsaved = self._unsaved, {}
+        if links:
+            await asyncio.to_thread(self._write, links)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self.save()
+            self._db.close()
+            self._db = None
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """Collapse whitespace and cut at a word boundary, marking the cut with '…'."""
+    text = " ".join(str(text).split())
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars - 1]
+    if " " in cut[max_chars // 2:]:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip(" ,.;:-") + "…"
+
+
+class OutputShaper:
+    """Turns a tool's list of dicts into a compact table that fits a byte budget.
+
+    A list of dicts reaches the model as its Python repr, repeating every key
+    on every row, and is persisted that way in the session. Here it becomes
+    one header line plus one `|`-separated line per row:
+
+        link|title|description
+        LK7QF2M3A nytimes.com|Climate tech funding rebounds…|Investors put $…
+
+    `max_chars` truncates fields, fields in `link_fields` become `LinkTable`
+    ids plus the site name, and rows that do not fit `budget_bytes` (UTF-8)
+    are dropped from the end, with a note saying how many. With
+    `budget_rows`, `budget_bytes` is the budget per that many rows, so a
+    tool asked for more results gets a proportionally larger budget. Apply
+    it under `@function_tool` (or call `render` from the tool), and give the
+    agent a tool that calls `links.resolve`.
+    """
+
+    def __init__(self, columns: tuple[str, ...] = ("link", "title", "description"),
+                 max_chars: dict[str, int] | None = None, link_fields: tuple[str, ...] = ("link",),
+                 budget_bytes: int = 2500, budget_rows: int | None = None, links: LinkTable | None = None):
+        self.columns = columns
+        self.max_chars = {"title": 80, "description": 160, **(max_chars or {})}
+        self.link_fields = link_fields
+        self.budget_bytes = budget_bytes
+        self.budget_rows = budget_rows
+        self.links = links or LinkTable()
+        self.calls = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.rows_dropped = 0
+
+    def _cell(self, column: str, value) -> str:
+        if value is None:
+            return ""
+        if column in self.link_fields:
+            ref = self.links.ref(value)
+            if ref is None:
+                return value
+            site = urlsplit(value).hostname or ""
+            return f"{ref} {site.removeprefix('www.')}".strip()
+        text = re.sub(r"\s*\|\s*", " / ", str(value))
+        limit = self.max_chars.get(column)
+        return truncate(text, limit) if limit else " ".join(text.split())
+
+    def budget_for(self, rows: int) -> int:
+        if self.budget_rows is None:
+            return self.budget_bytes
+        return self.budget_bytes * max(1, -(-rows // self.budget_rows))
+
+    def shape(self, rows: list[dict]) -> str:
+        if not rows:
+            return "no results"
+        budget = self.budget_for(len(rows))
+        lines = ["|".join(self.columns)]
+        used = len(lines[0].encode("utf-8"))
+        for n, row in enumerate(rows):
+            line = "|".join(self._cell(column, row.get(column)) for column in self.columns)
+            size = len(line.encode("utf-8")) + 1
+            remaining = len(rows) - n
+            # keep room for the "omitted" note unless this is the last row
+            note = 0 if remaining == 1 else 64
+            if used + size + note > budget:
+                if n == 0:  # not even one full row fits: cut it to the budget
+                    room = max(0, budget - used - note - 1)
+                    lines.append(line.encode("utf-8")[:room].decode("utf-8", "ignore"))
+                    remaining -= 1
+                if remaining:
+                    self.rows_dropped += remaining
+                    lines.append(f"(+{remaining} more results omitted to fit the output budget)")
+                break
+            lines.append(line)
+            used += size
+        return "\n".join(lines)
+
+    def render(self, rows: list[dict]) -> str:
+        """`shape` plus the byte counts reported by `metrics`."""
+        self.calls += 1
+        self.bytes_in += len(str(rows).encode("utf-8"))
+        output = self.shape(rows)
+        self.bytes_out += len(output.encode("utf-8"))
+        return output
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def shaped(*args, **kwargs):
+                return self.render(await func(*args, **kwargs))
+        else:
+            @functools.wraps(func)
+            def shaped(*args, **kwargs):
+                return self.render(func(*args, **kwargs))
+        shaped.__annotations__ = {**func.__annotations__, "return": str}
+        return shaped
+
+    def metrics(self) -> dict:
+        return {
+            "calls": self.calls,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "saved": 1 - self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+            "rows_dropped": self.rows_dropped,
+        }
@@ -0,0 +1,71 @@
+"""Prompt tokens per turn for web_search results: the list of dicts as the SDK sends it vs. the shaped table.
+
+Replays recorded_search_results.json (six searches, 10 results each) as one
+session. Tool outputs stay in the conversation, so every later turn sends
+them again; the session total counts that. Then three of the searches are
+shaped as one 30-result output, as for web_search(max_results=30), once
+under a fixed budget and once under the per-10-rows budget web_search uses.
+Tokens come from tiktoken when it is installed, otherwise from a bytes / 4
+estimate.
+
+    python output_shaping_bench.py --budget 3000
+"""
+import argparse
+import json
+from pathlib import Path
+
+from output_shaping import OutputShaper
+
+FIXTURE = Path(__file__).with_name("recorded_search_results.json")
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+def token_counter():
+    if tiktoken is not None:
+        encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(encoding.encode(text)), "tiktoken o200k_base"
+    return lambda text: (len(text.encode("utf-8")) + 3) // 4, "bytes / 4 estimate"
+
+
+def main(args) -> None:
+    count, method = token_counter()
+    turns = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    shaper = OutputShaper(budget_bytes=args.budget, budget_rows=10)
+    print(f"tokens: {method}, output budget {args.budget} bytes per 10 results")
+    print(f"{'query':<52} | {'raw':>6} | {'shaped':>6} | saved")
+    raw_history = shaped_history = raw_session = shaped_session = 0
+    for turn in turns:
+        raw = count(str(turn["results"]))  # what a list[dict] tool output becomes
+        shaped = count(shaper.shape(turn["results"]))
+        print(f"{turn['query'][:52]:<52} | {raw:>6} | {shaped:>6} | {1 - shaped / raw:5.0%}")
+        raw_history += raw
+        shaped_history += shaped
+        raw_session += raw_history  # each turn re-sends every earlier tool output
+        shaped_session += shaped_history
+    print(f"{'per turn (mean)':<52} | {raw_history // len(turns):>6} | {shaped_history // len(turns):>6} | "
+          f"{1 - shaped_history / raw_history:5.0%}")
+    print(f"{'session prompt tokens from tool outputs':<52} | {raw_session:>6} | {shaped_session:>6} | "
+          f"{1 - shaped_session / raw_session:5.0%}")
+    print(f"rows dropped to fit the budget: {shaper.rows_dropped}")
+
+    rows = [result for turn in turns[:3] for result in turn["results"]]
+    print(f"\n{len(rows)} results in one output (max_results={len(rows)}):")
+    for label, budgeted in (("fixed budget", OutputShaper(budget_bytes=args.budget)),
+                            ("budget per 10 rows", OutputShaper(budget_bytes=args.budget, budget_rows=10))):
+        output = budgeted.shape(rows)
+        print(f"  {label:<20} {budgeted.budget_for(len(rows)):>6} bytes allowed, "
+              f"{len(output.encode('utf-8')):>6} used, {count(output):>5} tokens, "
+              f"rows dropped: {budgeted.rows_dropped}")
+
+    print("\nfirst shaped output:\n")
+    print(OutputShaper(budget_bytes=args.budget, links=shaper.links).shape(turns[0]["results"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=int, default=3000)
+    main(parser.parse_args())
@@ -0,0 +1,121 @@
+import asyncio
+import functools
+import inspect
+import os
+import time
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from agents import function_tool
+from agents.tool_context import ToolContext
+
+
+class ParallelTools:
+    """Opt-in concurrent execution for one agent's tools.
+
+    The Runner already starts all tool calls from a model turn together, but
+    depending on the SDK release a plain `def` tool either runs on the event
+    loop (blocking it, so slow sync tools take the sum of their latencies)
+    or on asyncio's default executor, shared by the whole process. Tools
+    wrapped here run sync bodies on this agent's own thread pool and await
+    async ones, all under one `max_concurrency` cap, so a turn takes about as
+    long as its slowest call. Results still come back in call order. Apply
+    it under `@function_tool`:
+
+        parallel = ParallelTools(max_concurrency=4)
+
+        @function_tool
+        @parallel
+        def user_preferences(user_id: str) -> str: ...
+    """
+
+    def __init__(self, max_concurrency: int = 4, executor: Executor | None = None):
+        self.max_concurrency = max_concurrency
+        self.executor = executor or ThreadPoolExecutor(max_concurrency, thread_name_prefix="tool")
+        self._semaphores = weakref.WeakKeyDictionary()  # event loop -> asyncio.Semaphore
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def run(*args, **kwargs):
+                async with self._semaphore():
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            async def run(*args, **kwargs):
+                async with self._semaphore():
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+        return run
+
+    async def gather(self, *calls, return_exceptions: bool = False) -> list:
+        """Run `(func, kwargs)` pairs concurrently under this cap; results in call order."""
+        return await asyncio.gather(*(self(func)(**kwargs) for func, kwargs in calls),
+                                    return_exceptions=return_exceptions)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False)
+
+
+# Usage: one CafeFinder turn that calls two slow sync tools, as the Runner does
+# (all tool calls of the turn started together with asyncio.gather)
+def slow_search(query: str) -> str:
+    """Stands in for a blocking search request."""
+    time.sleep(0.3)
+    return f"results for {query}"
+
+
+def slow_preferences(user_id: str) -> str:
+    """Stands in for a blocking profile lookup."""
+    time.sleep(0.2)
+    return "likes quiet places, outdoor seating, medium roast"
+
+
+async def turn(tools) -> float:
+    search, preferences = tools
+    calls = ((search, '{"query": "coffee shops San Francisco"}'), (preferences, '{"user_id": "user_123"}'))
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        tool.on_invoke_tool(ToolContext(context=None, tool_name=tool.name, tool_call_id=f"call_{n}",
+                                        tool_arguments=arguments), arguments)
+        for n, (tool, arguments) in enumerate(calls)
+    ))
+    return time.perf_counter() - start
+
+
+async def turn_while_busy(tools) -> float:
+    """A turn while other conversations' blocking tools hold asyncio's default executor."""
+    loop = asyncio.get_running_loop()
+    default_workers = min(32, (os.cpu_count() or 1) + 4)  # ThreadPoolExecutor's default size
+    busy = [loop.run_in_executor(None, time.sleep, 1.0) for _ in range(default_workers)]
+    elapsed = await turn(tools)
+    await asyncio.gather(*busy)
+    return elapsed
+
+
+async def main():
+    parallel = ParallelTools(max_concurrency=4)
+    sequential = (function_tool(slow_search), function_tool(slow_preferences))
+    concurrent = (function_tool(parallel(slow_search)), function_tool(parallel(slow_preferences)))
+    print("tool latencies: 300 ms + 200 ms")
+    # SDK releases that offload sync tools to asyncio's default executor already
+    # overlap the two calls here; older ones run them back to back on the loop.
+    print(f"plain @function_tool: {await turn(sequential) * 1e3:.0f} ms per turn")
+    print(f"ParallelTools:        {await turn(concurrent) * 1e3:.0f} ms per turn")
+    # Where the own pool pays off on every release: the shared default executor is full.
+    print("with the default executor busy for 1 s:")
+    print(f"plain @function_tool: {await turn_while_busy(sequential) * 1e3:.0f} ms per turn")
+    print(f"ParallelTools:        {await turn_while_busy(concurrent) * 1e3:.0f} ms per turn")
+    print("gather:", await parallel.gather((slow_search, {"query": "weather SF"}),
+                                          (slow_preferences, {"user_id": "user_123"})))
+    parallel.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,201 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections import deque
+
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+
+class RateLimitTimeout(Exception):
+    """The call could not be scheduled within its `max_wait`; it was dropped before reaching the API."""
+
+
+class TokenBucket:
+    """`limit` calls per `period` seconds, refilled continuously, bursting up to `limit`."""
+
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self.rate = limit / period
+        self.tokens = float(limit)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.limit, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float, reserve: float = 0.0) -> float:
+        """Seconds until a token can be taken while leaving `reserve` of the bucket untouched."""
+        self._refill(now)
+        needed = 1 + reserve * self.limit
+        return 0.0 if self.tokens >= needed else (needed - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def drain(self) -> None:
+        self.tokens = min(self.tokens, 0.0)
+
+
+class _KeyState:
+    def __init__(self, limits):
+        self.buckets = [TokenBucket(limit, period) for limit, period in limits]
+        self.queue = []  # heap of [rank, seq, future]
+        self.blocked_until = 0.0
+
+    def wait_time(self, now: float, reserve: float) -> float:
+        return max([self.blocked_until - now] + [bucket.wait_time(now, reserve) for bucket in self.buckets])
+
+    def wake_head(self) -> None:
+        if self.queue and self.queue[0][2] is not None and not self.queue[0][2].done():
+            self.queue[0][2].set_result(None)
+
+
+class RateLimiter:
+    """Shared quota scheduler for outbound tool APIs: one set of token buckets per API key.
+
+    Every agent in the process that calls the API with the same key goes
+    through the same buckets, e.g. `[(100, 60), (10_000, 86_400)]` for a
+    per-minute and a per-day quota, so bursts queue here instead of coming
+    back as 429s. Waiters are served by priority class, then arrival order;
+    `batch` calls also leave `batch_reserve` of each bucket for
+    `interactive` ones. A call that would wait longer than its class's
+    `max_wait` is dropped with `RateLimitTimeout` (turned into a fallback
+    answer by `failure_error_function`) instead of stalling the turn. When
+    the API still answers 429, `throttled()` pauses the key for the
+    server's Retry-After.
+    """
+
+    def __init__(self, limits: list[tuple[int, float]], batch_reserve: float = 0.2,
+                 max_wait: dict[str, float | None] | None = None, window: int = 1000):
+        self.limits = limits
+        self.batch_reserve = batch_reserve
+        self.max_wait = {"interactive": 10.0, "batch": None, **(max_wait or {})}
+        self._keys: dict[str, _KeyState] = {}
+        self._seq = itertools.count()
+        self._waits = {priority: deque(maxlen=window) for priority in PRIORITIES}
+        self.granted = dict.fromkeys(PRIORITIES, 0)
+        self.dropped = dict.fromkeys(PRIORITIES, 0)
+        self.throttled_responses = 0
+
+    def _state(self, key: str) -> _KeyState:
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = _KeyState(self.limits)
+        return state
+
+    async def acquire(self, key: str, priority: str = "interactive", max_wait: float | None = None) -> float:
+        """Wait for a token for `key`; returns the seconds spent waiting."""
+        if max_wait is None:
+            max_wait = self.max_wait[priority]
+        reserve = self.batch_reserve if priority == "batch" else 0.0
+        state = self._state(key)
+        start = time.monotonic()
+        deadline = None if max_wait is None else start + max_wait
+        entry = [PRIORITIES[priority], next(self._seq), None]
+        heapq.heappush(state.queue, entry)
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                now = time.monotonic()
+                if state.queue[0] is entry:
+                    timeout = state.wait_time(now, reserve)
+                    if timeout <= 0:
+                        for bucket in state.buckets:
+                            bucket.take()
+                        heapq.heappop(state.queue)
+                        waited = now - start
+                        self._waits[priority].append(waited)
+                        self.granted[priority] += 1
+                        return waited
+                    if deadline is not None and now + timeout > deadline:
+                        raise RateLimitTimeout(f"{key!r}: next {priority} slot in {timeout:.1f}s, "
+                                               f"beyond max_wait of {max_wait:g}s")
+                else:
+                    # Behind other waiters: sleep until this entry reaches the head (or gives up)
+                    timeout = None if deadline is None else deadline - now
+                    if timeout is not None and timeout <= 0:
+                        raise RateLimitTimeout(f"{key!r}: still queued after max_wait of {max_wait:g}s")
+                entry[2] = loop.create_future()
+                try:
+                    await asyncio.wait_for(entry[2], timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:  # dropped or cancelled
+            self.dropped[priority] += 1
+            state.queue.remove(entry)
+            heapq.heapify(state.queue)
+            raise
+        finally:
+            state.wake_head()  # the next waiter may take a token now
+
+    def throttled(self, key: str, retry_after: float) -> None:
+        """The API answered 429 anyway (another process shares the key): hold all callers for `retry_after`."""
+        self.throttled_responses += 1
+        state = self._state(key)
+        for bucket in state.buckets:
+            bucket.drain()
+        state.blocked_until = max(state.blocked_until, time.monotonic() + retry_after)
+
+    def metrics(self) -> dict:
+        metrics = {"throttled_responses": self.throttled_responses,
+                   "queued": sum(len(state.queue) for state in self._keys.values())}
+        for priority, waits in self._waits.items():
+            ordered = sorted(waits)
+            metrics[priority] = {
+                "granted": self.granted[priority],
+                "dropped": self.dropped[priority],
+                "wait_p50_ms": round(ordered[len(ordered) // 2] * 1e3, 1) if ordered else None,
+                "wait_p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e3, 1)
+                if ordered else None,
+                "wait_max_ms": round(ordered[-1] * 1e3, 1) if ordered else None,
+            }
+        return metrics
+
+
+def limiter_from_env() -> RateLimiter | None:
+    """The shared client's limiter: WEB_SEARCH_QUOTA_PER_MINUTE / _PER_DAY (0 disables either)."""
+    limits = [(int(os.environ.get("WEB_SEARCH_QUOTA_PER_MINUTE", "100")), 60.0),
+              (int(os.environ.get("WEB_SEARCH_QUOTA_PER_DAY", "10000")), 86400.0)]
+    limits = [(limit, period) for limit, period in limits if limit > 0]
+    return RateLimiter(limits) if limits else None
+
+
+# Usage: 20 chat turns and a 40-query batch job sharing one key against a stub
+# that allows 10 searches per second; batch queries give up after 4 s in the queue
+async def main():
+    import httpx
+    from search_stub_server import serve_in_thread
+    from web_search_client import WebSearchClient
+
+    server, base_url = serve_in_thread(latency=0.05, quota=(10, 1.0))
+    for name, limiter in (("no limiter", None), ("limiter", RateLimiter([(10, 1.0)], max_wait={"batch": 4.0}))):
+        client = WebSearchClient(base_url=base_url, api_key=f"key-{name}", limiter=limiter)
+        outcomes = {"ok": 0, "429": 0, "dropped": 0}
+
+        async def one(query: str, priority: str, delay: float):
+            await asyncio.sleep(delay)
+            try:
+                await client.search(query, priority=priority)
+                outcomes["ok"] += 1
+            except RateLimitTimeout:
+                outcomes["dropped"] += 1
+            except httpx.HTTPStatusError as exc:
+                status = str(exc.response.status_code)
+                outcomes[status] = outcomes.get(status, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(one(f"batch query {n}", "batch", 0.0) for n in range(40)),
+            *(one(f"chat question {n}", "interactive", n * 0.1) for n in range(20)),
+        )
+        print(f"{name:>10}: {time.perf_counter() - start:.1f} s, {outcomes}")
+        if limiter is not None:
+            print("           ", limiter.metrics())
+        await client.aclose()
+    server.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""Local stand-in for the Google Custom Search JSON API, for offline runs and benchmarks.
+
+    python search_stub_server.py --port 8765 --latency 0.2 --quota 100/60
+    export WEB_SEARCH_BASE_URL=http://127.0.0.1:8765/customsearch/v1
+"""
+import argparse
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+
+class SearchStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    latency = 0.05  # seconds per request
+    quota = None  # (limit, period): per-key token bucket, like the API's queries-per-minute quota
+    buckets: dict = {}  # api key -> [tokens, updated]
+    quota_lock = threading.Lock()
+
+    def _over_quota(self, key: str) -> float:
+        """Takes a token for `key`; returns 0, or the seconds until one is available."""
+        if self.quota is None:
+            return 0.0
+        limit, period = self.quota
+        now = time.monotonic()
+        with self.quota_lock:
+            tokens, updated = self.buckets.get(key, (limit, now))
+            tokens = min(limit, tokens + (now - updated) * limit / period)
+            if tokens < 1:
+                self.buckets[key] = (tokens, now)
+                return (1 - tokens) * period / limit
+            self.buckets[key] = (tokens - 1, now)
+        return 0.0
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != "/customsearch/v1":
+            self._reply(404, {"error": {"code": 404, "message": "not found"}})
+            return
+        params = parse_qs(url.query)
+        retry_after = self._over_quota(params.get("key", [""])[0])
+        if retry_after:
+            self._reply(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED",
+                                        "message": "Quota exceeded for quota metric 'Queries'"}},
+                        {"Retry-After": str(math.ceil(retry_after))})
+            return
+        query = params.get("q", [""])[0]
+        num = min(int(params.get("num", ["10"])[0]), 10)
+        start = int(params.get("start", ["1"])[0])
+        if start + num - 1 > 100:
+            self._reply(400, {"error": {"code": 400, "status": "INVALID_ARGUMENT",
+                                        "message": "Request contains an invalid argument."}})
+            return
+        time.sleep(self.latency)
+        # Like the real API, the first hit of a page can repeat the last one of the previous page
+        items = [
+            {
+                "title": f"{query} - result {n}",
+                "link": f"https://example.com/{quote(query)}/{n - 1 if n == start > 1 else n}",
+                "snippet": f"Result {n} for '{query}': a short snippet of the page text.",
+            }
+            for n in range(start, start + num)
+        ]
+        self._reply(200, {"queries": {"request": [{"searchTerms": query, "startIndex": start}]}, "items": items})
+
+    def _reply(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_in_thread(latency: float = 0.05, port: int = 0,
+                    quota: tuple[int, float] | None = None) -> tuple[ThreadingHTTPServer, str]:
+    """Start the stub on a background thread; returns the server and its search URL.
+
+    With `quota=(limit, period)`, each API key may make `limit` requests per
+    `period` seconds (bursting up to `limit`); the rest get 429 and Retry-After.
+    """
+    handler = type("SearchStub", (SearchStubHandler,), {"latency": latency, "quota": quota, "buckets": {}})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler, bind_and_activate=False)
+    server.request_queue_size = 256  # the default backlog of 5 drops bursts of new connections
+    server.server_bind()
+    server.server_activate()
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/customsearch/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds to wait before each response")
+    parser.add_argument("--quota", help="per-key quota as LIMIT/SECONDS, e.g. 100/60")
+    args = parser.parse_args()
+    quota = None
+    if args.quota:
+        limit, period = args.quota.split("/")
+        quota = (int(limit), float(period))
+    server, url = serve_in_thread(args.latency, args.port, quota)
+    print(f"export WEB_SEARCH_BASE_URL={url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
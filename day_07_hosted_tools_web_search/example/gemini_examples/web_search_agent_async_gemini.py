@@ -1,6 +1,6 @@
 import asyncio
-import requests
-from agents import Agent, Runner, OpenAIChatCompletionsModel, function_tool
+from agents import Agent, Runner, OpenAIChatCompletionsModel
+from web_search_client import resolve_link, web_search  # pooled async client, shared by the day 7 examples
 from openai import AsyncOpenAI
 
 # ✅ Gemini client setup
@@ -15,40 +15,12 @@ model = OpenAIChatCompletionsModel(
     openai_client=client
 )
 
-@function_tool
-def web_search(query: str):
-    """
-    Performs a web search using Google Custom Search API.
-
-    Args:
-        query: The search query.
-    Returns:
-        List of dictionaries containing title, link, and description.
-    """
-
-    API_KEY = "GOOGLE_API_KEY"
-    CX = "Search_Engine_Id"
-    num_results = 10  # max 10 per request
-
-    url = f"https://www.googleapis.com/customsearch/v1?q={query}&key={API_KEY}&cx={CX}&num={num_results}"
-
-    response = requests.get(url)
-    data = response.json()
-
-    results = []
-    for item in data.get("items", []):
-        results.append({
-            "title": item.get("title"),
-            "link": item.get("link"),
-            "description": item.get("snippet")
-        })
-    return results
 
 # ✅ Create the agent
 agent = Agent(
     name="SearchBuddyAsync",
     instructions="What is Ai.",
-    tools=[web_search],
+    tools=[web_search, resolve_link],
     model=model
 )
 
@@ -0,0 +1,82 @@
+"""Concurrent web searches against the local stub: blocking per-call requests vs. the pooled async client.
+
+The old tool opened a new connection per call and blocked the event loop
+while it waited, so parallel runs searched one after another. Each simulated
+run here makes 3 searches; wall time and event-loop lag are reported.
+
+    python web_search_bench.py --latency 0.05 --runs 1,10,50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import urllib.request
+from urllib.parse import urlencode
+
+from search_stub_server import serve_in_thread
+from web_search_client import WebSearchClient
+
+SEARCHES_PER_RUN = 3
+
+
+def blocking_search(base_url: str, query: str) -> list[dict]:
+    """What the old tool did with requests.get: a fresh connection per call, on the loop."""
+    url = f"{base_url}?{urlencode({'q': query, 'key': 'k', 'cx': 'cx', 'num': 10})}"
+    with urllib.request.urlopen(url) as response:
+        data = json.loads(response.read())
+    return [{"title": item.get("title"), "link": item.get("link"), "description": item.get("snippet")}
+            for item in data.get("items", [])]
+
+
+async def measure_lag(samples: list[float], stop: asyncio.Event, interval: float = 0.001) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+async def run_blocking(base_url: str, run: int) -> None:
+    for n in range(SEARCHES_PER_RUN):
+        blocking_search(base_url, f"coffee shops run {run} query {n}")
+        await asyncio.sleep(0)  # the model turn between tool calls
+
+
+async def run_pooled(client: WebSearchClient, run: int) -> None:
+    for n in range(SEARCHES_PER_RUN):
+        await client.search(f"coffee shops run {run} query {n}")
+        await asyncio.sleep(0)
+
+
+async def bench(name: str, runs: int, make_run) -> None:
+    lag, stop = [], asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(lag, stop))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await asyncio.gather(*(make_run(run) for run in range(runs)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    lag.sort()
+    p99 = lag[min(len(lag) - 1, int(len(lag) * 0.99))] if lag else 0.0
+    print(f"{name:>9} | {runs:>4} runs | {elapsed:7.2f} s | "
+          f"loop lag p50 {statistics.median(lag) * 1e3 if lag else 0:7.1f} ms, p99 {p99 * 1e3:7.1f} ms")
+
+
+async def main(args) -> None:
+    server, base_url = serve_in_thread(latency=args.latency)
+    client = WebSearchClient(base_url=base_url, api_key="k", cx="cx")
+    await client.search("warm up")  # building the client's TLS context is a one-off cost
+    print(f"{SEARCHES_PER_RUN} searches per run, {args.latency * 1e3:.0f} ms server latency")
+    for runs in args.runs:
+        await bench("blocking", runs, lambda run: run_blocking(base_url, run))
+        await bench("pooled", runs, lambda run: run_pooled(client, run))
+    await client.aclose()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--runs", type=lambda s: [int(n) for n in s.split(",")], default=[1, 10, 50])
+    asyncio.run(main(parser.parse_args()))
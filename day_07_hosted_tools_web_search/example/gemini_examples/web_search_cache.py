@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_query(query: str, sort_words: bool = False) -> str:
+    """Case- and whitespace-insensitive form of a query; optionally ignore word order too."""
+    words = query.casefold().split()
+    if sort_words:
+        words.sort()
+    return " ".join(words)
+
+
+class SearchCache:
+    """TTL + size-bounded LRU of web_search results, keyed on the normalized query.
+
+    Follow-up turns and researcher agents often repeat a search with small
+    differences in case or spacing; those now cost a dictionary lookup
+    instead of a round trip and a unit of API quota. With `db_path` the
+    entries also go to a small SQLite table and survive restarts. Cached
+    result lists are shared between callers: treat them as read-only.
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1024, sort_words: bool = False,
+                 db_path: str | None = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.sort_words = sort_words
+        self.db_path = db_path
+        self._entries: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()  # key -> (expires_at, results)
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._db = None
+        if db_path:
+            self._db_lock = threading.Lock()
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS search_cache "
+                             "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, results TEXT NOT NULL)")
+            self._load()
+
+    def key(self, query: str, num: int = 10, start: int = 1) -> str:
+        return f"{num}:{start}:{normalize_query(query, self.sort_words)}"
+
+    def get(self, key: str) -> list[dict] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, results = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return results
+
+    def _remember(self, key: str, results: list[dict]) -> tuple[float, list[str]]:
+        expires_at = time.time() + self.ttl
+        self._entries[key] = (expires_at, results)
+        self._entries.move_to_end(key)
+        evicted = []
+        while len(self._entries) > self.max_entries:
+            evicted.append(self._entries.popitem(last=False)[0])
+            self.evictions += 1
+        return expires_at, evicted
+
+    def _persist(self, key: str, expires_at: float, results: list[dict], evicted: list[str]) -> None:
+        with self._db_lock:
+            self._db.execute("INSERT OR REPLACE INTO search_cache (key, expires_at, results) VALUES (?, ?, ?)",
+                             (key, expires_at, json.dumps(results)))
+            self._db.executemany("DELETE FROM search_cache WHERE key = ?", [(k,) for k in evicted])
+
+    def put(self, key: str, results: list[dict]) -> None:
+        expires_at, evicted = self._remember(key, results)
+        if self._db is not None:
+            self._persist(key, expires_at, results, evicted)
+
+    async def aput(self, key: str, results: list[dict]) -> None:
+        """`put` that keeps the SQLite write off the event loop when persisting.
+
+        The in-memory LRU is only ever touched on the event loop, like `get`;
+        just the database write runs in a thread.
+        """
+        expires_at, evicted = self._remember(key, results)
+        if self._db is not None:
+            await asyncio.to_thread(self._persist, key, expires_at, results, evicted)
+
+    def _load(self) -> None:
+        now = time.time()
+        with self._db_lock:
+            self._db.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+            rows = self._db.execute("SELECT key, expires_at, results FROM search_cache "
+                                    "ORDER BY expires_at DESC LIMIT ?", (self.max_entries,)).fetchall()
+        for key, expires_at, results in reversed(rows):
+            self._entries[key] = (expires_at, json.loads(results))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM search_cache")
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def cache_from_env() -> SearchCache | None:
+    """The shared client's cache: WEB_SEARCH_CACHE_TTL seconds (0 disables), WEB_SEARCH_CACHE_DB to persist."""
+    ttl = float(os.environ.get("WEB_SEARCH_CACHE_TTL", "600"))
+    if ttl <= 0:
+        return None
+    return SearchCache(ttl=ttl, max_entries=int(os.environ.get("WEB_SEARCH_CACHE_SIZE", "1024")),
+                       db_path=os.environ.get("WEB_SEARCH_CACHE_DB") or None)
+
+
+# Usage: a research session that keeps re-asking nearly the same things
+async def main():
+    from search_stub_server import serve_in_thread
+    from web_search_client import WebSearchClient
+
+    server, base_url = serve_in_thread(latency=0.2)
+    queries = [
+        "best coffee shops San Francisco",
+        "Best coffee shops  san francisco",
+        "weather San Francisco today",
+        "best coffee shops san francisco",
+        "WEATHER san francisco today",
+        "quiet cafes with outdoor seating San Francisco",
+    ]
+    for name, cache in (("no cache", None), ("cache", SearchCache(ttl=300))):
+        client = WebSearchClient(base_url=base_url, cache=cache)
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            await client.search(query)
+            latencies.append(time.perf_counter() - start)
+        print(f"{name:>8}: {len(queries)} searches in {sum(latencies):.2f} s")
+        if cache is not None:
+            print("         ", cache.metrics())
+        await client.aclose()
+    server.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
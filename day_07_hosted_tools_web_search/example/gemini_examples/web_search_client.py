@@ -0,0 +1,228 @@
+import asyncio
+import os
+import time
+import weakref
+from contextlib import aclosing
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator
+
+import httpx
+from agents import function_tool
+from output_shaping import LinkTable, OutputShaper
+from rate_limiter import RateLimiter, limiter_from_env
+from web_search_cache import SearchCache, cache_from_env
+
+# Point WEB_SEARCH_BASE_URL at search_stub_server.py to run offline.
+SEARCH_URL = os.environ.get("WEB_SEARCH_BASE_URL", "https://www.googleapis.com/customsearch/v1")
+API_KEY = os.environ.get("GOOGLE_API_KEY", "GOOGLE_API_KEY")
+CX = os.environ.get("SEARCH_ENGINE_ID", "Search_Engine_Id")
+PAGE_SIZE = 10  # the API's maximum `num`
+MAX_RESULTS = 100  # the API serves nothing past result 100
+
+
+def retry_after_seconds(value: str | None, default: float = 1.0) -> float:
+    """Seconds to wait from a Retry-After header: delay-seconds or an HTTP-date (RFC 9110)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):  # unparseable; fall back rather than fail the tool call
+        return default
+
+
+class WebSearchClient:
+    """Google Custom Search over a pooled, keep-alive `httpx.AsyncClient`.
+
+    Requests never block the event loop, so parallel `Runner.run` calls can
+    search at the same time, and repeated searches reuse open connections
+    instead of paying a TCP + TLS handshake each. An httpx client belongs to
+    the event loop that created it, so one is kept per loop (`Runner.run_sync`
+    starts a fresh loop on every call). With a `SearchCache`, repeated
+    queries are answered from it without a request. With a `RateLimiter`,
+    requests wait for the API key's quota instead of drawing 429s; a 429
+    that gets through anyway pauses the key for its Retry-After and the
+    request is retried once.
+    """
+
+    def __init__(self, base_url: str = SEARCH_URL, api_key: str = API_KEY, cx: str = CX,
+                 timeout: httpx.Timeout = httpx.Timeout(10.0, connect=3.0), max_connections: int = 32,
+                 cache: SearchCache | None = None, limiter: RateLimiter | None = None):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.cx = cx
+        self.timeout = timeout
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.cache = cache
+        self.limiter = limiter
+        self._clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+        return client
+
+    async def search(self, query: str, num: int = 10, start: int = 1, priority: str = "interactive",
+                     max_wait: float | None = None) -> list[dict]:
+        if self.cache is not None:
+            key = self.cache.key(query, num, start)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        for attempt in range(2):
+            if self.limiter is not None:
+                await self.limiter.acquire(self.api_key, priority, max_wait)
+            # httpx URL-encodes params: queries with spaces, '&' or '#' arrive intact
+            response = await self._client().get(self.base_url, params={
+                "q": query, "key": self.api_key, "cx": self.cx, "num": num, "start": start,
+            })
+            if response.status_code != 429 or self.limiter is None:
+                break
+            self.limiter.throttled(self.api_key, retry_after_seconds(response.headers.get("Retry-After")))
+        response.raise_for_status()
+        results = [
+            {"title": item.get("title"), "link": item.get("link"), "description": item.get("snippet")}
+            for item in response.json().get("items", [])
+        ]
+        if self.cache is not None:
+            await self.cache.aput(key, results)
+        return results
+
+    async def iter_results(self, query: str, max_results: int = 10, priority: str = "interactive",
+                           spare_pages: int = 1) -> AsyncIterator[dict]:
+        """Stream up to `max_results` unique results, fetching the pages concurrently.
+
+        All pages needed for `max_results` (plus `spare_pages` to make up for
+        duplicate links, when more than one page is needed) are requested at
+        once; results are yielded in rank order as soon as their page has
+        landed. Once enough are in hand, or a short page marks the end of
+        the results, the remaining requests are cancelled. Consume it with
+        `contextlib.aclosing` when stopping early, so that happens promptly.
+        An error on a later page ends the stream instead of discarding the
+        results already yielded.
+        """
+        max_results = max(1, min(max_results, MAX_RESULTS))
+        starts = range(1, MAX_RESULTS + 1, PAGE_SIZE)
+        needed = -(-max_results // PAGE_SIZE)
+        pages: dict[int, asyncio.Future] = {}
+
+        def fetch(count: int) -> None:
+            for start in starts[len(pages):len(pages) + count]:
+                pages[start] = asyncio.ensure_future(self.search(query, PAGE_SIZE, start, priority))
+
+        fetch(needed + spare_pages if needed > 1 else 1)
+        seen = set()
+        try:
+            for start in starts:
+                if start not in pages:
+                    fetch(1)  # duplicates left us short: one more page
+                try:
+                    results = await pages[start]
+                except Exception:
+                    if seen:
+                        return
+                    raise
+                for result in results:
+                    link = (result.get("link") or "").split("#")[0].rstrip("/")
+                    if link in seen:
+                        continue
+                    seen.add(link)
+                    yield result
+                    if len(seen) >= max_results:
+                        return
+                if len(results) < PAGE_SIZE:
+                    return
+        finally:
+            for task in pages.values():
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # retrieved: no "never retrieved" warning for unused pages
+
+    async def search_many(self, query: str, max_results: int = 10, priority: str = "interactive") -> list[dict]:
+        return [result async for result in self.iter_results(query, max_results, priority)]
+
+    async def aclose(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+search_client = WebSearchClient(cache=cache_from_env(), limiter=limiter_from_env())
+# Results reach the model (and the session) as a compact table within this many
+# bytes per page of 10; a page of recorded results shapes to about 2.4 KB.
+# Link refs are kept in WEB_SEARCH_LINKS_DB (empty disables) so resolve_link
+# still works for refs in a session resumed by a later process.
+search_output = OutputShaper(budget_bytes=int(os.environ.get("WEB_SEARCH_OUTPUT_BYTES", "3000")),
+                             budget_rows=PAGE_SIZE,
+                             links=LinkTable(db_path=os.environ.get("WEB_SEARCH_LINKS_DB", "web_search_links.db") or None))
+
+
+@function_tool
+async def web_search(query: str, max_results: int = 10) -> str:
+    """
+    Performs a web search using Google Custom Search API.
+
+    Args:
+        query: The search query.
+        max_results: How many results to return (1-100); more than 10 are fetched as pages in parallel.
+    Returns:
+        A table with one line per result: link reference and site, title, description.
+        Pass a link reference (e.g. "LK7QF2M3A") to resolve_link to get its full URL.
+    """
+    # The SDK hands a tool's output to the model only once it returns, so the
+    # stream is collected here; iter_results still cancels unneeded pages.
+    output = search_output.render(await search_client.search_many(query, max_results))
+    await search_output.links.asave()
+    return output
+
+
+@function_tool
+def resolve_link(ref: str) -> str:
+    """
+    Returns the full URL for a link reference from web_search results.
+
+    Args:
+        ref: The link reference, e.g. "LK7QF2M3A".
+    """
+    return search_output.links.resolve(ref) or f"Unknown link reference {ref!r}; run web_search again."
+
+
+# Usage: 30 results, paged by the model one call at a time vs. fetched in parallel,
+# and a streaming consumer that stops after 5 (python web_search_client.py)
+async def main():
+    from search_stub_server import serve_in_thread
+
+    server, base_url = serve_in_thread(latency=0.2)
+    client = WebSearchClient(base_url=base_url)
+    query = "climate technology headlines"
+
+    start = time.perf_counter()
+    paged = [result for page in range(3) for result in await client.search(query, start=1 + page * PAGE_SIZE)]
+    print(f"sequential pages: {len(paged)} results ({len({r['link'] for r in paged})} unique) "
+          f"in {time.perf_counter() - start:.2f} s, plus a model turn per page")
+
+    start = time.perf_counter()
+    results = await client.search_many(query, 30)
+    print(f"parallel pages:   {len(results)} unique results in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    received = 0
+    async with aclosing(client.iter_results(query, 30)) as stream:
+        async for result in stream:
+            received += 1
+            if received == 1:
+                print(f"streaming:        first result after {time.perf_counter() - start:.2f} s")
+            if received == 5:
+                break
+    print(f"                  stopped after 5 results at {time.perf_counter() - start:.2f} s, other pages cancelled")
+    await client.aclose()
+    server.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
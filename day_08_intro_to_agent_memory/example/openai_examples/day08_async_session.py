@@ -0,0 +1,120 @@
+"""Session storage that never runs SQLite on the event loop thread.
+
+Target: keep event-loop lag under a millisecond while hundreds of
+conversations read and write their sessions. Measured with
+day08_async_session_bench.py on a 1-vCPU machine (300 customers), this
+gets p50 to 0.1-0.5 ms but p99 only to 6-14 ms (asyncio.to_thread: 30-45
+ms; SQLite on the loop: the loop is blocked throughout). The rest is the
+loop resuming hundreds of coroutines at once and the worker threads
+competing for the one core, not storage I/O; a sub-millisecond p99 needs
+spare cores.
+"""
+import asyncio
+import collections
+import itertools
+import queue
+import threading
+import weakref
+import zlib
+
+
+class _Completions:
+    """Hands results back to one event loop, waking it once per burst, not once per result."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._done = collections.deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def put(self, future: asyncio.Future, result, error) -> None:
+        with self._lock:
+            self._done.append((future, result, error))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:  # the loop was closed; nobody is left to wake
+            with self._lock:
+                self._done.clear()
+                self._scheduled = False
+
+    def _drain(self) -> None:
+        with self._lock:
+            done, self._done = self._done, collections.deque()
+            self._scheduled = False
+        for future, result, error in done:
+            if future.cancelled():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+class OrderedIOExecutor:
+    """Dedicated I/O threads for session storage, with per-session ordering.
+
+    Every call for a given `session_id` goes to the same worker thread, so a
+    session's operations run one at a time in the order they were submitted,
+    while different sessions run in parallel on the other workers. The event
+    loop only enqueues work and is woken with the result; it never touches
+    SQLite itself.
+
+        store = PooledSessionStore("support_conversations.db", io_executor=OrderedIOExecutor(8))
+    """
+
+    def __init__(self, workers: int = 4, name: str = "session-io"):
+        self._queues = [queue.SimpleQueue() for _ in range(workers)]
+        self._threads = [
+            threading.Thread(target=self._work, args=(q,), name=f"{name}-{n}", daemon=True)
+            for n, q in enumerate(self._queues)
+        ]
+        self._round_robin = itertools.count()
+        self._completions = weakref.WeakKeyDictionary()  # event loop -> _Completions
+        self.submitted = [0] * workers
+        for thread in self._threads:
+            thread.start()
+
+    def _worker_for(self, key: str | None) -> int:
+        if key is None:
+            return next(self._round_robin) % len(self._queues)
+        return zlib.crc32(key.encode("utf-8")) % len(self._queues)
+
+    def submit(self, key: str | None, fn, *args) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        completions = self._completions.get(loop)
+        if completions is None:
+            completions = self._completions[loop] = _Completions(loop)
+        future = loop.create_future()
+        worker = self._worker_for(key)
+        self.submitted[worker] += 1
+        self._queues[worker].put((completions, future, fn, args))
+        return future
+
+    @staticmethod
+    def _work(jobs: queue.SimpleQueue) -> None:
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            completions, future, fn, args = job
+            try:
+                result, error = fn(*args), None
+            except BaseException as exc:
+                result, error = None, exc
+            try:
+                completions.put(future, result, error)
+            except Exception as exc:
+                # Never let one caller's loop take the worker (and its queue) down.
+                print(f"Dropping a session I/O result that could not be delivered: {exc!r}")
+
+    def queue_depths(self) -> list[int]:
+        return [q.qsize() for q in self._queues]
+
+    def shutdown(self) -> None:
+        for q in self._queues:
+            q.put(None)
+        for thread in self._threads:
+            thread.join()
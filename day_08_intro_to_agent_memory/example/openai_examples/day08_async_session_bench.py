@@ -0,0 +1,128 @@
+"""Event-loop lag while many conversations hit session storage at once.
+
+A monitor task asks to wake every millisecond and records how late it
+actually wakes. That delay is how long any other coroutine (a streaming
+response, a tool call, a new request) would have been stalled.
+
+    python day08_async_session_bench.py --customers 500 --turns 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+from agents.memory import Session  # protocol interface
+from day08_async_session import OrderedIOExecutor
+from day08_pooled_session import PooledSessionStore
+
+
+class BlockingSQLiteSession(Session):
+    """What the problem looks like: `async def` methods doing SQLite I/O on the loop thread."""
+
+    def __init__(self, session_id: str, conn: sqlite3.Connection):
+        self.session_id = session_id
+        self._conn = conn
+
+    async def get_items(self, limit: int | None = None) -> List[dict]:
+        rows = self._conn.execute("SELECT message_data FROM agent_messages WHERE session_id = ? ORDER BY id",
+                                  (self.session_id,)).fetchall()
+        items = [json.loads(row[0]) for row in rows]
+        return items[-limit:] if limit else items
+
+    async def add_items(self, items: List[dict]) -> None:
+        with self._conn:
+            self._conn.executemany("INSERT INTO agent_messages (session_id, message_data) VALUES (?, ?)",
+                                   [(self.session_id, json.dumps(item)) for item in items])
+
+    async def pop_item(self) -> dict | None:
+        with self._conn:
+            row = self._conn.execute("SELECT id, message_data FROM agent_messages WHERE session_id = ? "
+                                     "ORDER BY id DESC LIMIT 1", (self.session_id,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("DELETE FROM agent_messages WHERE id = ?", (row[0],))
+        return json.loads(row[1])
+
+    async def clear_session(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM agent_messages WHERE session_id = ?", (self.session_id,))
+
+
+async def monitor_lag(stop: asyncio.Event, lags_ms: List[float], interval: float = 0.001) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags_ms.append(max(0.0, (time.perf_counter() - start - interval) * 1000))
+
+
+async def run(session_for, customers: int, turns: int) -> dict:
+    async def customer(n: int):
+        session = session_for(f"customer_{n}")
+        for turn in range(turns):
+            await session.get_items()
+            await session.add_items([
+                {"role": "user", "content": f"Question {turn} about order #{n}"},
+                {"role": "assistant", "content": f"Answer {turn}: order #{n} ships tomorrow."},
+            ])
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(customer(n) for n in range(customers)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    lags.sort()
+    return {
+        "turns_per_s": customers * turns / elapsed,
+        "lag_p50_ms": statistics.median(lags),
+        "lag_p99_ms": lags[int(len(lags) * 0.99)],
+        "lag_max_ms": lags[-1],
+    }
+
+
+async def main(customers: int, turns: int, workers: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+
+        store = PooledSessionStore(os.path.join(tmp, "blocking.db"))
+        conn = sqlite3.connect(store.db_path)
+        results["sqlite on the loop"] = await run(lambda sid: BlockingSQLiteSession(sid, conn), customers, turns)
+        conn.close()
+        store.close()
+
+        store = PooledSessionStore(os.path.join(tmp, "to_thread.db"))
+        results["pooled, asyncio.to_thread"] = await run(store.session, customers, turns)
+        store.close()
+
+        executor = OrderedIOExecutor(workers)
+        store = PooledSessionStore(os.path.join(tmp, "ordered.db"), io_executor=executor)
+        results[f"pooled, {workers} ordered I/O threads"] = await run(store.session, customers, turns)
+        store.close()
+        executor.shutdown()
+
+    print(f"{customers} concurrent customers x {turns} turns (GIL switch interval "
+          f"{sys.getswitchinterval() * 1000:.1f} ms)\n")
+    print(f"{'backend':<32} {'turns/s':>9} {'lag p50':>9} {'lag p99':>9} {'lag max':>9}")
+    for name, r in results.items():
+        print(f"{name:<32} {r['turns_per_s']:>9.0f} {r['lag_p50_ms']:>6.2f} ms {r['lag_p99_ms']:>6.2f} ms "
+              f"{r['lag_max_ms']:>6.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--switch-interval-ms", type=float, default=0.5,
+                        help="how long a worker thread may hold the GIL before the loop thread gets a turn")
+    args = parser.parse_args()
+    sys.setswitchinterval(args.switch_interval_ms / 1000)
+    asyncio.run(main(args.customers, args.turns, args.workers))
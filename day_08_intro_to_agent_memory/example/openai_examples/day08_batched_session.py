@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import time
+from typing import List
+
+from agents.memory import Session  # protocol interface
+from day08_pooled_session import PooledSessionStore
+
+# Durability modes
+FLUSH_EVERY_TURN = "turn"  # add_items returns once its items are committed (group commit)
+FLUSH_ON_INTERVAL = "interval"  # add_items returns at once; items are committed within max_delay_ms
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingSessionStore:
+    """Group-commit wrapper around a `PooledSessionStore`.
+
+    `add_items` calls from many sessions are buffered and written together in
+    one transaction every `max_delay_ms` milliseconds, or sooner once
+    `max_items` items are waiting. Reads of a session with buffered items
+    flush first, so every session still reads its own writes.
+    """
+
+    def __init__(self, store: PooledSessionStore, durability: str = FLUSH_EVERY_TURN,
+                 max_delay_ms: float = 5.0, max_items: int = 500):
+        if durability not in (FLUSH_EVERY_TURN, FLUSH_ON_INTERVAL):
+            raise ValueError(f"unknown durability mode: {durability!r}")
+        self.store = store
+        self.durability = durability
+        self.max_delay = max_delay_ms / 1000
+        self.max_items = max_items
+        self._pending: dict[str, List[dict]] = {}
+        self._pending_count = 0
+        self._waiters: List[asyncio.Future] = []
+        self._in_flight: set[str] = set()
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.flushes = 0
+        self.items_flushed = 0
+
+    def session(self, session_id: str) -> "BatchedSession":
+        return BatchedSession(session_id, self)
+
+    def _ensure_flusher(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                if self.durability == FLUSH_ON_INTERVAL:
+                    # The batch was re-queued; back off and try it again.
+                    logger.exception("Session batch flush failed, retrying")
+                else:
+                    # Its add_items callers have already received the error.
+                    logger.exception("Session batch flush failed")
+                await asyncio.sleep(self.max_delay)
+
+    async def add_items(self, session_id: str, items: List[dict]) -> None:
+        if not items:
+            return
+        self._ensure_flusher()
+        self._pending.setdefault(session_id, []).extend(items)
+        self._pending_count += len(items)
+        self._wakeup.set()
+        if self._pending_count >= self.max_items:
+            self._full.set()
+        if self.durability == FLUSH_EVERY_TURN:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+
+    async def flush(self) -> None:
+        """Commit everything buffered so far in one transaction."""
+        async with self._flush_lock:
+            if not self._pending:
+                # pop_item/clear_session may have dropped every buffered item;
+                # there is nothing left to commit for whoever is still waiting.
+                waiters, self._waiters = self._waiters, []
+                self._wakeup.clear()
+                self._full.clear()
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+                return
+            batch = list(self._pending.items())
+            waiters = self._waiters
+            count = self._pending_count
+            self._pending, self._waiters, self._pending_count = {}, [], 0
+            self._wakeup.clear()
+            self._full.clear()
+            self._in_flight = {session_id for session_id, _ in batch}
+            try:
+                await self.store._run(self.store._add_items_many, batch)
+            except Exception as exc:
+                if self.durability == FLUSH_ON_INTERVAL:
+                    self._requeue(batch)
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+                raise
+            finally:
+                self._in_flight = set()
+            self.flushes += 1
+            self.items_flushed += count
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def _requeue(self, batch: List[tuple[str, List[dict]]]) -> None:
+        # Put a failed batch back in front of anything added since.
+        newer = self._pending
+        self._pending = {}
+        for session_id, items in batch:
+            self._pending.setdefault(session_id, []).extend(items)
+        for session_id, items in newer.items():
+            self._pending.setdefault(session_id, []).extend(items)
+        self._pending_count = sum(len(items) for items in self._pending.values())
+        self._wakeup.set()
+
+    def _has_unflushed(self, session_id: str) -> bool:
+        return session_id in self._pending or session_id in self._in_flight
+
+    async def get_items(self, session_id: str, limit: int | None = None,
+                        token_budget: int | None = None) -> List[dict]:
+        if self._has_unflushed(session_id):
+            await self.flush()
+        if token_budget is not None:
+            return await self.store._run(self.store._get_items_within_budget, session_id, token_budget, limit)
+        return await self.store._run(self.store._get_items, session_id, limit)
+
+    async def pop_item(self, session_id: str) -> dict | None:
+        pending = self._pending.get(session_id)
+        if pending:
+            # Still buffered: undo it without touching the database.
+            self._pending_count -= 1
+            item = pending.pop()
+            if not pending:
+                del self._pending[session_id]
+            return item
+        if session_id in self._in_flight:
+            await self.flush()
+        return await self.store._run(self.store._pop_item, session_id)
+
+    async def clear_session(self, session_id: str) -> None:
+        dropped = self._pending.pop(session_id, [])
+        self._pending_count -= len(dropped)
+        if session_id in self._in_flight:
+            await self.flush()
+        await self.store._run(self.store._clear_session, session_id)
+
+    async def close(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+
+class BatchedSession(Session):
+    """A `Session` whose writes are group-committed by a `BatchingSessionStore`."""
+
+    def __init__(self, session_id: str, batcher: BatchingSessionStore):
+        self.session_id = session_id
+        self._batcher = batcher
+
+    async def get_items(self, limit: int | None = None, *, token_budget: int | None = None) -> List[dict]:
+        return await self._batcher.get_items(self.session_id, limit, token_budget)
+
+    async def add_items(self, items: List[dict]) -> None:
+        await self._batcher.add_items(self.session_id, list(items))
+
+    async def pop_item(self) -> dict | None:
+        return await self._batcher.pop_item(self.session_id)
+
+    async def clear_session(self) -> None:
+        await self._batcher.clear_session(self.session_id)
+
+
+# Usage: 1000 conversations each finishing a turn at the same moment
+async def main():
+    store = PooledSessionStore("support_conversations.db")
+    batcher = BatchingSessionStore(store, durability=FLUSH_EVERY_TURN, max_delay_ms=5)
+
+    async def turn(customer_id: int):
+        session = batcher.session(f"customer_{customer_id}")
+        await session.add_items([
+            {"role": "user", "content": "Where is my order?"},
+            {"role": "assistant", "content": "It ships tomorrow."},
+        ])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(turn(c) for c in range(1000)))
+    elapsed = time.perf_counter() - start
+    print(f"1000 turns committed in {batcher.flushes} transactions, {elapsed * 1000:.0f} ms")
+    await batcher.close()
+    store.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
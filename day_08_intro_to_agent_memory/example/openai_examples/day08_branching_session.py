@@ -0,0 +1,248 @@
+import asyncio
+import json
+import uuid
+from typing import List
+
+from agents import Agent, Runner
+from agents.memory import Session  # protocol interface
+from day08_pooled_session import SQLiteConnectionPool
+
+# A branch's history is a chain of segments. Each segment owns the items at
+# positions [base_length, ...) and sees its parent's items below base_length.
+# Forking only adds a segment row, so branches share their common prefix.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS branch_segments (
+    segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    parent_segment INTEGER REFERENCES branch_segments (segment_id),
+    base_length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_branch_segments_parent ON branch_segments (parent_segment, base_length);
+CREATE TABLE IF NOT EXISTS branch_heads (
+    session_id TEXT PRIMARY KEY,
+    segment_id INTEGER NOT NULL REFERENCES branch_segments (segment_id),
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_branch_heads_segment ON branch_heads (segment_id);
+CREATE TABLE IF NOT EXISTS branch_items (
+    segment_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    message_data TEXT NOT NULL,
+    PRIMARY KEY (segment_id, position)
+) WITHOUT ROWID;
+"""
+
+
+class BranchingSessionStore:
+    """SQLite store for sessions that can be forked copy-on-write.
+
+    `fork()` is O(1) and writes nothing but a segment row; each branch then
+    stores only the items it adds. Undo (`pop_item`) never deletes an item
+    another branch still sees: if the item is shared, the branch moves to a
+    fresh segment instead.
+    """
+
+    def __init__(self, db_path: str = "branching_conversations.db", max_connections: int = 8):
+        self.pool = SQLiteConnectionPool(db_path, max_connections=max_connections)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def session(self, session_id: str) -> "BranchingSession":
+        return BranchingSession(session_id, self)
+
+    async def _run(self, fn, *args):
+        return await asyncio.to_thread(fn, *args)
+
+    # --- helpers (called inside a transaction) ----------------------------
+
+    @staticmethod
+    def _head(conn, session_id: str) -> tuple[int, int]:
+        row = conn.execute("SELECT segment_id, length FROM branch_heads WHERE session_id = ?",
+                           (session_id,)).fetchone()
+        if row is not None:
+            return row
+        segment = conn.execute("INSERT INTO branch_segments (parent_segment, base_length) VALUES (NULL, 0)").lastrowid
+        conn.execute("INSERT INTO branch_heads (session_id, segment_id, length) VALUES (?, ?, 0)",
+                     (session_id, segment))
+        return segment, 0
+
+    @staticmethod
+    def _segment(conn, segment: int) -> tuple[int | None, int]:
+        return conn.execute("SELECT parent_segment, base_length FROM branch_segments WHERE segment_id = ?",
+                            (segment,)).fetchone()
+
+    def _read(self, conn, segment: int, start: int, end: int) -> List[dict]:
+        """Items at positions [start, end) as seen from `segment`."""
+        chunks = []
+        upto = end
+        while segment is not None and upto > start:
+            parent, base = self._segment(conn, segment)
+            low = max(base, start)
+            if low < upto:
+                rows = conn.execute(
+                    "SELECT message_data FROM branch_items WHERE segment_id = ? AND position >= ? AND position < ? "
+                    "ORDER BY position", (segment, low, upto)).fetchall()
+                chunks.append([json.loads(row[0]) for row in rows])
+            upto = min(upto, base)
+            segment = parent
+        chunks.reverse()
+        return [item for chunk in chunks for item in chunk]
+
+    @staticmethod
+    def _pinned(conn, segment: int, position: int) -> bool:
+        """Does a child branch still see `position` of this segment?"""
+        return conn.execute("SELECT 1 FROM branch_segments WHERE parent_segment = ? AND base_length > ? LIMIT 1",
+                            (segment, position)).fetchone() is not None
+
+    @staticmethod
+    def _collect(conn, segment: int | None) -> None:
+        """Delete segments nothing refers to any more, walking up the chain."""
+        while segment is not None:
+            if conn.execute("SELECT 1 FROM branch_heads WHERE segment_id = ? LIMIT 1", (segment,)).fetchone():
+                return
+            if conn.execute("SELECT 1 FROM branch_segments WHERE parent_segment = ? LIMIT 1", (segment,)).fetchone():
+                return
+            parent = conn.execute("SELECT parent_segment FROM branch_segments WHERE segment_id = ?",
+                                  (segment,)).fetchone()[0]
+            conn.execute("DELETE FROM branch_items WHERE segment_id = ?", (segment,))
+            conn.execute("DELETE FROM branch_segments WHERE segment_id = ?", (segment,))
+            segment = parent
+
+    # --- operations -------------------------------------------------------
+
+    def _get_items(self, session_id: str, limit: int | None) -> List[dict]:
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN")  # read-only snapshot; writers are not blocked
+            try:
+                head = conn.execute("SELECT segment_id, length FROM branch_heads WHERE session_id = ?",
+                                    (session_id,)).fetchone()
+                if head is None:
+                    return []
+                segment, length = head
+                start = 0 if limit is None else max(0, length - limit)
+                return self._read(conn, segment, start, length)
+            finally:
+                conn.execute("COMMIT")
+
+    def _add_items(self, session_id: str, items: List[dict]) -> None:
+        if not items:
+            return
+        with self.pool.transaction() as conn:
+            segment, length = self._head(conn, session_id)
+            conn.executemany("INSERT INTO branch_items (segment_id, position, message_data) VALUES (?, ?, ?)",
+                             [(segment, length + n, json.dumps(item)) for n, item in enumerate(items)])
+            conn.execute("UPDATE branch_heads SET length = ? WHERE session_id = ?",
+                         (length + len(items), session_id))
+
+    def _pop_item(self, session_id: str) -> dict | None:
+        with self.pool.transaction() as conn:
+            segment, length = self._head(conn, session_id)
+            if length == 0:
+                return None
+            position = length - 1
+            item = self._read(conn, segment, position, length)[0]
+            _, base = self._segment(conn, segment)
+            if not self._pinned(conn, segment, position):
+                if position >= base:
+                    conn.execute("DELETE FROM branch_items WHERE segment_id = ? AND position = ?",
+                                 (segment, position))
+                else:
+                    # Empty, unshared segment: just stop seeing one more parent item.
+                    conn.execute("UPDATE branch_segments SET base_length = ? WHERE segment_id = ?",
+                                 (position, segment))
+            else:
+                # Another branch sees this item: leave it and continue on a new segment.
+                segment = conn.execute("INSERT INTO branch_segments (parent_segment, base_length) VALUES (?, ?)",
+                                       (segment, position)).lastrowid
+            conn.execute("UPDATE branch_heads SET segment_id = ?, length = ? WHERE session_id = ?",
+                         (segment, position, session_id))
+            return item
+
+    def _clear_session(self, session_id: str) -> None:
+        with self.pool.transaction() as conn:
+            old_segment, _ = self._head(conn, session_id)
+            segment = conn.execute("INSERT INTO branch_segments (parent_segment, base_length) VALUES (NULL, 0)").lastrowid
+            conn.execute("UPDATE branch_heads SET segment_id = ?, length = 0 WHERE session_id = ?",
+                         (segment, session_id))
+            self._collect(conn, old_segment)
+
+    def _fork(self, session_id: str, child_id: str, at_item: int | None) -> None:
+        with self.pool.transaction() as conn:
+            segment, length = self._head(conn, session_id)
+            at_item = length if at_item is None else at_item
+            if not 0 <= at_item <= length:
+                raise ValueError(f"at_item must be between 0 and {length}, got {at_item}")
+            if conn.execute("SELECT 1 FROM branch_heads WHERE session_id = ?", (child_id,)).fetchone():
+                raise ValueError(f"session {child_id!r} already exists")
+            child = conn.execute("INSERT INTO branch_segments (parent_segment, base_length) VALUES (?, ?)",
+                                 (segment, at_item)).lastrowid
+            conn.execute("INSERT INTO branch_heads (session_id, segment_id, length) VALUES (?, ?, ?)",
+                         (child_id, child, at_item))
+
+    def _delete_session(self, session_id: str) -> None:
+        with self.pool.transaction() as conn:
+            row = conn.execute("SELECT segment_id FROM branch_heads WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None:
+                return
+            conn.execute("DELETE FROM branch_heads WHERE session_id = ?", (session_id,))
+            self._collect(conn, row[0])
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class BranchingSession(Session):
+    """A `Session` that can be forked at any item without copying history."""
+
+    def __init__(self, session_id: str, store: BranchingSessionStore):
+        self.session_id = session_id
+        self._store = store
+
+    async def get_items(self, limit: int | None = None) -> List[dict]:
+        return await self._store._run(self._store._get_items, self.session_id, limit)
+
+    async def add_items(self, items: List[dict]) -> None:
+        await self._store._run(self._store._add_items, self.session_id, list(items))
+
+    async def pop_item(self) -> dict | None:
+        return await self._store._run(self._store._pop_item, self.session_id)
+
+    async def clear_session(self) -> None:
+        await self._store._run(self._store._clear_session, self.session_id)
+
+    async def fork(self, at_item: int | None = None, session_id: str | None = None) -> "BranchingSession":
+        """New session that sees this one's first `at_item` items (all of them by default)."""
+        child_id = session_id or f"{self.session_id}/{uuid.uuid4().hex[:8]}"
+        await self._store._run(self._store._fork, self.session_id, child_id, at_item)
+        return BranchingSession(child_id, self._store)
+
+    async def delete(self) -> None:
+        """Drop this branch; items no other branch shares are removed."""
+        await self._store._run(self._store._delete_session, self.session_id)
+
+
+# Usage: retry from a turn and A/B answers without popping or copying history
+async def main():
+    agent = Agent(name="Calc", instructions="Answer math questions simply.")
+    store = BranchingSessionStore()
+    session = store.session("correction_example")
+    await session.clear_session()
+
+    await Runner.run(agent, "What's 2 + 2?", session=session)
+    before_question = len(await session.get_items()) - 2  # user question + assistant answer
+
+    # Retry from before the question: the original branch is untouched
+    retry = await session.fork(at_item=before_question)
+    res = await Runner.run(agent, "What's 2 + 3?", session=retry)
+    print("Corrected answer:", res.final_output)
+
+    # A/B: two alternatives continuing the same conversation
+    concise, detailed = await session.fork(), await session.fork()
+    a, b = await asyncio.gather(
+        Runner.run(agent, "Now double it. Just the number.", session=concise),
+        Runner.run(agent, "Now double it and explain each step.", session=detailed),
+    )
+    print("A:", a.final_output)
+    print("B:", b.final_output)
+
+if __name__ == "__main__":
+    asyncio.run(main())
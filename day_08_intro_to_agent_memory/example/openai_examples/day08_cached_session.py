@@ -0,0 +1,217 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import List
+
+from agents.memory import Session  # protocol interface
+from day08_pooled_session import PooledSessionStore
+
+
+class _Entry:
+    __slots__ = ("items", "sizes", "bytes")
+
+    def __init__(self):
+        self.items: List[dict] = []
+        self.sizes: List[int] = []
+        self.bytes = 0
+
+
+def _size(item: dict) -> int:
+    return len(json.dumps(item, separators=(",", ":")))
+
+
+class HotSessionCache:
+    """LRU of decoded session histories, bounded by their total JSON size."""
+
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, session_id: str) -> _Entry | None:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(session_id)
+        self.hits += 1
+        return entry
+
+    def put(self, session_id: str, items: List[dict]) -> None:
+        self.invalidate(session_id)
+        entry = _Entry()
+        self._entries[session_id] = entry
+        self.append(session_id, items)
+
+    def append(self, session_id: str, items: List[dict]) -> None:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return
+        for item in items:
+            size = _size(item)
+            entry.items.append(item)
+            entry.sizes.append(size)
+            entry.bytes += size
+            self.bytes += size
+        self._evict()
+
+    def pop(self, session_id: str) -> None:
+        entry = self._entries.get(session_id)
+        if entry is not None and entry.items:
+            entry.items.pop()
+            size = entry.sizes.pop()
+            entry.bytes -= size
+            self.bytes -= size
+
+    def invalidate(self, session_id: str) -> None:
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self.bytes -= entry.bytes
+
+    def _evict(self) -> None:
+        while self.bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self.bytes -= entry.bytes
+            self.evictions += 1
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "sessions": len(self._entries),
+            "bytes": self.bytes,
+        }
+
+
+class CachedSessionStore:
+    """Write-through hot-session cache (tier 1) in front of a `PooledSessionStore` (tier 2).
+
+    A hit serves `get_items` from memory without touching SQLite or
+    decoding anything. Writes go to SQLite first and are then applied to
+    the cached copy; if two writes to the same session overlap, the copy is
+    dropped instead, since they may have committed in either order. Cached
+    items are shared between callers: treat them as read-only.
+    """
+
+    def __init__(self, store: PooledSessionStore, max_bytes: int = 64 * 2**20):
+        self.store = store
+        self.cache = HotSessionCache(max_bytes)
+        self._generation: dict[str, int] = {}
+        self._writes_in_flight: dict[str, int] = {}
+        self._overlapped: set[str] = set()
+
+    def session(self, session_id: str) -> "CachedSession":
+        return CachedSession(session_id, self)
+
+    async def get_items(self, session_id: str, limit: int | None = None) -> List[dict]:
+        entry = self.cache.get(session_id)
+        if entry is None:
+            generation = self._generation.get(session_id, 0)
+            items = await self.store._run(self.store._get_items, session_id, None)
+            # Only cache what we read if no write landed while we were reading.
+            if generation == self._generation.get(session_id, 0) and not self._writes_in_flight.get(session_id):
+                self.cache.put(session_id, items)
+        else:
+            items = entry.items
+        if limit is None or limit >= len(items):
+            return list(items)
+        if limit <= 0:
+            return []
+        tail = list(islice(reversed(items), limit))
+        tail.reverse()
+        return tail
+
+    async def _write(self, session_id: str, fn, *args):
+        in_flight = self._writes_in_flight.get(session_id, 0)
+        if in_flight:
+            self._overlapped.add(session_id)
+        self._writes_in_flight[session_id] = in_flight + 1
+        self._generation[session_id] = self._generation.get(session_id, 0) + 1
+        try:
+            return await self.store._run(fn, session_id, *args)
+        except BaseException:
+            self._overlapped.add(session_id)
+            raise
+        finally:
+            remaining = self._writes_in_flight[session_id] - 1
+            if remaining:
+                self._writes_in_flight[session_id] = remaining
+            else:
+                del self._writes_in_flight[session_id]
+            if session_id in self._overlapped:
+                self.cache.invalidate(session_id)
+                if not remaining:
+                    self._overlapped.discard(session_id)
+
+    async def add_items(self, session_id: str, items: List[dict]) -> None:
+        await self._write(session_id, self.store._add_items, items)
+        if session_id not in self._overlapped:
+            self.cache.append(session_id, items)
+
+    async def pop_item(self, session_id: str) -> dict | None:
+        item = await self._write(session_id, self.store._pop_item)
+        if item is not None and session_id not in self._overlapped:
+            self.cache.pop(session_id)
+        return item
+
+    async def clear_session(self, session_id: str) -> None:
+        await self._write(session_id, self.store._clear_session)
+        self.cache.invalidate(session_id)
+
+
+class CachedSession(Session):
+    """A `Session` served from a `CachedSessionStore`."""
+
+    def __init__(self, session_id: str, store: CachedSessionStore):
+        self.session_id = session_id
+        self._store = store
+
+    async def get_items(self, limit: int | None = None) -> List[dict]:
+        return await self._store.get_items(self.session_id, limit)
+
+    async def add_items(self, items: List[dict]) -> None:
+        await self._store.add_items(self.session_id, list(items))
+
+    async def pop_item(self) -> dict | None:
+        return await self._store.pop_item(self.session_id)
+
+    async def clear_session(self) -> None:
+        await self._store.clear_session(self.session_id)
+
+
+# Usage: read latency of a hot 40-item conversation, SQLite vs. cache
+async def main(reads: int = 2000):
+    store = PooledSessionStore("support_conversations.db")
+    cached = CachedSessionStore(store, max_bytes=16 * 2**20)
+    session = cached.session("customer_hot")
+    await session.clear_session()
+    for turn in range(20):
+        await session.add_items([
+            {"role": "user", "content": f"Question {turn} about order #12345"},
+            {"role": "assistant", "content": f"Answer {turn}: order #12345 ships tomorrow."},
+        ])
+
+    start = time.perf_counter()
+    for _ in range(reads):
+        await store.session("customer_hot").get_items()
+    sqlite_us = (time.perf_counter() - start) / reads * 1e6
+
+    start = time.perf_counter()
+    for _ in range(reads):
+        await session.get_items()
+    cached_us = (time.perf_counter() - start) / reads * 1e6
+
+    print(f"get_items(): SQLite {sqlite_us:.0f} us, cached {cached_us:.1f} us")
+    print(cached.cache.metrics())
+    store.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,252 @@
+import asyncio
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Iterator, List
+from urllib.parse import quote
+
+from agents.memory import Session  # protocol interface
+
+# Record: payload length (u32), crc32 of op + payload (u32), op (u8), payload.
+HEADER = struct.Struct("<IIB")
+OP_END = 0  # zero-filled, preallocated space: nothing written here yet
+OP_APPEND = 1
+OP_POP = 2
+OP_CLEAR = 3
+
+
+def _crc(op: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(bytes((op,))))
+
+
+class SessionLog:
+    """One conversation as an append-only, length-prefixed log in a memory-mapped file.
+
+    `pop_item` and `clear_session` are appended as records too, so the file
+    is a complete audit trail. An in-memory index of live item offsets makes
+    the last N items O(N) to read. Opening the file replays it front to back;
+    a torn or corrupt record at the tail (a crash mid-write) ends the replay
+    and is wiped, which is the whole of crash recovery.
+    """
+
+    def __init__(self, path: str, grow_by: int = 1 << 20):
+        self.path = path
+        self.grow_by = grow_by
+        self._offsets: List[tuple[int, int]] = []
+        self.recovered_bytes = 0
+        self.pins = 0  # flushes in flight on another thread; MmapLogStore closes an evicted log after them
+        self.evicted = False
+        self._lock = threading.Lock()  # the map is never remapped or closed under a flush
+        self._closed = False
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._file = os.fdopen(fd, "r+b")
+        if os.fstat(fd).st_size == 0:
+            os.ftruncate(fd, grow_by)
+        self._map = mmap.mmap(fd, 0)
+        self._end = self._replay()
+
+    def _records(self) -> Iterator[tuple[int, int, int]]:
+        """(op, payload offset, payload length) for every valid record, in order."""
+        pos, size = 0, len(self._map)
+        while pos + HEADER.size <= size:
+            length, crc, op = HEADER.unpack_from(self._map, pos)
+            start, end = pos + HEADER.size, pos + HEADER.size + length
+            if op == OP_END or op > OP_CLEAR or end > size or _crc(op, self._map[start:end]) != crc:
+                return
+            yield op, start, length
+            pos = end
+
+    def _replay(self) -> int:
+        end = 0
+        for op, start, length in self._records():
+            if op == OP_APPEND:
+                self._offsets.append((start, length))
+            elif op == OP_POP:
+                if self._offsets:
+                    self._offsets.pop()
+            else:
+                self._offsets.clear()
+            end = start + length
+        # Anything after the last valid record is a torn write: wipe it so a
+        # new record written at `end` can never run into stale bytes.
+        tail = self._map[end:]
+        if tail.strip(b"\x00"):
+            self.recovered_bytes = len(tail.rstrip(b"\x00"))
+            self._map[end:] = bytes(len(tail))
+            self._map.flush()
+        return end
+
+    def _ensure_room(self, needed: int) -> None:
+        if self._end + needed <= len(self._map):
+            return
+        new_size = len(self._map) + max(self.grow_by, needed)
+        with self._lock:
+            self._map.close()
+            os.ftruncate(self._file.fileno(), new_size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def _append(self, op: int, payload: bytes = b"") -> int:
+        self._ensure_room(HEADER.size + len(payload))
+        start = self._end + HEADER.size
+        # Payload first, header last: until the header lands the record reads as "end of log".
+        self._map[start:start + len(payload)] = payload
+        HEADER.pack_into(self._map, self._end, len(payload), _crc(op, payload), op)
+        self._end = start + len(payload)
+        return start
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._map.flush()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def tail(self, limit: int | None = None) -> List[dict]:
+        offsets = self._offsets if limit is None else self._offsets[-limit:] if limit > 0 else []
+        return [json.loads(self._map[start:start + length]) for start, length in offsets]
+
+    def append(self, items: List[dict]) -> None:
+        for item in items:
+            payload = json.dumps(item, separators=(",", ":")).encode("utf-8")
+            self._offsets.append((self._append(OP_APPEND, payload), len(payload)))
+
+    def pop(self) -> dict | None:
+        if not self._offsets:
+            return None
+        start, length = self._offsets[-1]
+        item = json.loads(self._map[start:start + length])
+        self._append(OP_POP)
+        self._offsets.pop()
+        return item
+
+    def clear(self) -> None:
+        self._append(OP_CLEAR)
+        self._offsets.clear()
+
+    def history(self) -> Iterator[tuple[str, dict | None]]:
+        """Every operation ever logged, oldest first: ("append", item), ("pop", None), ("clear", None)."""
+        names = {OP_APPEND: "append", OP_POP: "pop", OP_CLEAR: "clear"}
+        for op, start, length in self._records():
+            yield names[op], json.loads(self._map[start:start + length]) if op == OP_APPEND else None
+
+    def compact(self) -> None:
+        """Rewrite only the live items (drops the audit trail of pops and clears)."""
+        items = self.tail()
+        tmp_path = self.path + ".compact"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        fresh = SessionLog(tmp_path, grow_by=self.grow_by)
+        fresh.append(items)
+        fresh.flush()
+        fresh.close()
+        self.close()
+        os.replace(tmp_path, self.path)
+        self.__init__(self.path, grow_by=self.grow_by)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._map.close()
+            self._file.close()
+
+
+class MmapLogStore:
+    """A directory of per-session logs, keeping at most `max_open` files mapped."""
+
+    def __init__(self, directory: str = "session_logs", grow_by: int = 1 << 20, sync: bool = False,
+                 max_open: int = 256):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.grow_by = grow_by
+        self.sync = sync
+        self.max_open = max_open
+        self._open: OrderedDict[str, SessionLog] = OrderedDict()
+
+    def session(self, session_id: str) -> "MmapLogSession":
+        return MmapLogSession(session_id, self)
+
+    def log(self, session_id: str) -> SessionLog:
+        log = self._open.get(session_id)
+        if log is not None:
+            self._open.move_to_end(session_id)
+            return log
+        path = os.path.join(self.directory, quote(session_id, safe="") + ".log")
+        log = self._open[session_id] = SessionLog(path, grow_by=self.grow_by)
+        while len(self._open) > self.max_open:
+            _, oldest = self._open.popitem(last=False)
+            oldest.evicted = True
+            if not oldest.pins:
+                oldest.close()  # else the last flush in flight closes it
+        return log
+
+    async def _after_write(self, log: SessionLog) -> None:
+        if not self.sync:
+            return
+        log.pins += 1
+        try:
+            await asyncio.to_thread(log.flush)  # msync blocks; keep it off the loop
+        finally:
+            log.pins -= 1
+            if log.evicted and not log.pins:
+                log.close()
+
+    def close(self) -> None:
+        while self._open:
+            self._open.popitem()[1].close()
+
+
+class MmapLogSession(Session):
+    """Drop-in for `SQLiteSession` backed by an append-only memory-mapped log."""
+
+    def __init__(self, session_id: str, store: MmapLogStore):
+        self.session_id = session_id
+        self._store = store
+
+    async def get_items(self, limit: int | None = None) -> List[dict]:
+        return self._store.log(self.session_id).tail(limit)
+
+    async def add_items(self, items: List[dict]) -> None:
+        log = self._store.log(self.session_id)
+        log.append(items)
+        await self._store._after_write(log)
+
+    async def pop_item(self) -> dict | None:
+        log = self._store.log(self.session_id)
+        item = log.pop()
+        await self._store._after_write(log)
+        return item
+
+    async def clear_session(self) -> None:
+        log = self._store.log(self.session_id)
+        log.clear()
+        await self._store._after_write(log)
+
+
+# Usage (same calls as day08_memory_ops.py)
+async def demo():
+    store = MmapLogStore("session_logs", sync=True)
+    session = store.session("memory_ops")
+
+    await session.add_items([
+        {"role": "user", "content": "Hello!"},
+        {"role": "assistant", "content": "Hi there! How can I help?"}
+    ])
+    print("Memory contains", len(await session.get_items()), "items.")
+    print("Removed last item:", await session.pop_item())
+    await session.clear_session()
+    print("Cleared session. Items now:", await session.get_items())
+
+    print("Audit trail:")
+    for op, item in store.log("memory_ops").history():
+        print(" ", op, item or "")
+    store.close()
+
+if __name__ == "__main__":
+    asyncio.run(demo())
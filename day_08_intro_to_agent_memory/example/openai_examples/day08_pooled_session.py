@@ -0,0 +1,264 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import List
+
+from agents.memory import Session  # protocol interface
+from day08_session_codec import JSONCodec
+from day08_token_count import count_tokens, newest_within_budget
+
+# Same tables as the SDK's SQLiteSession, so an existing
+# support_conversations.db can be opened by the pooled store as-is.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS agent_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    message_data TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (session_id) REFERENCES agent_sessions (session_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_agent_messages_session_id
+    ON agent_messages (session_id, created_at);
+"""
+# Added on top of the SDK layout; older databases get it via ALTER TABLE.
+ADD_TOKEN_COUNT = "ALTER TABLE agent_messages ADD COLUMN token_count INTEGER"
+
+# The SQL text never changes, so sqlite3's per-connection statement cache
+# prepares each of these once per pooled connection and reuses it for
+# every session that borrows that connection.
+SELECT_ALL = "SELECT message_data FROM agent_messages WHERE session_id = ? ORDER BY id ASC"
+SELECT_TAIL = "SELECT message_data FROM agent_messages WHERE session_id = ? ORDER BY id DESC LIMIT ?"
+UPSERT_SESSION = "INSERT OR IGNORE INTO agent_sessions (session_id) VALUES (?)"
+INSERT_MESSAGE = "INSERT INTO agent_messages (session_id, message_data, token_count) VALUES (?, ?, ?)"
+TOUCH_SESSION = "UPDATE agent_sessions SET updated_at = CURRENT_TIMESTAMP WHERE session_id = ?"
+SELECT_LAST = "SELECT id, message_data FROM agent_messages WHERE session_id = ? ORDER BY id DESC LIMIT 1"
+SELECT_NEWEST_FIRST = ("SELECT id, message_data, token_count FROM agent_messages "
+                       "WHERE session_id = ? ORDER BY id DESC")
+SET_TOKEN_COUNT = "UPDATE agent_messages SET token_count = ? WHERE id = ?"
+DELETE_MESSAGE = "DELETE FROM agent_messages WHERE id = ?"
+DELETE_MESSAGES = "DELETE FROM agent_messages WHERE session_id = ?"
+DELETE_SESSION = "DELETE FROM agent_sessions WHERE session_id = ?"
+
+
+class SQLiteConnectionPool:
+    """A bounded pool of WAL-mode connections to one SQLite file."""
+
+    def __init__(self, db_path: str, max_connections: int = 8, busy_timeout: float = 30.0,
+                 cached_statements: int = 64):
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            isolation_level=None,  # we issue BEGIN/COMMIT ourselves
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        # Only takes effect on a new file (or after VACUUM); lets the compactor
+        # in day08_session_compaction.py give pages back without a full VACUUM.
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.max_connections:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+        # Pool is at capacity: wait for another thread to hand one back.
+        return self._idle.get(timeout=self.busy_timeout)
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Borrow a connection and run the block in one write transaction."""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class PooledSessionStore:
+    """Shared backend that hands out lightweight sessions over one connection pool.
+
+    Create one store per database file at startup and call `session(id)` per
+    request instead of constructing a new `SQLiteSession` every message.
+    Pass `codec=BinaryCodec()` from `day08_session_codec.py` to store items
+    in the compact binary format instead of JSON text, and
+    `io_executor=OrderedIOExecutor()` from `day08_async_session.py` to run
+    each session's database calls in order on dedicated I/O threads.
+    """
+
+    def __init__(self, db_path: str = "support_conversations.db", max_connections: int = 8,
+                 codec=None, io_executor=None):
+        self.db_path = db_path
+        self.codec = codec or JSONCodec()
+        self.io_executor = io_executor
+        self.pool = SQLiteConnectionPool(db_path, max_connections=max_connections)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(agent_messages)")}
+            if "token_count" not in columns:
+                conn.execute(ADD_TOKEN_COUNT)
+
+    def session(self, session_id: str, token_budget: int | None = None) -> "PooledSession":
+        return PooledSession(session_id, self, token_budget=token_budget)
+
+    def _rows(self, session_id: str, items: List[dict]) -> List[tuple]:
+        return [(session_id, self.codec.encode(item), count_tokens(item)) for item in items]
+
+    async def _run(self, fn, *args):
+        # SQLite calls block, so keep them off the event loop thread.
+        if self.io_executor is not None:
+            # Per-session methods all take the session_id first; use it as the ordering key.
+            key = args[0] if args and isinstance(args[0], str) else None
+            return await self.io_executor.submit(key, fn, *args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _get_items(self, session_id: str, limit: int | None) -> List[dict]:
+        with self.pool.connection() as conn:
+            if limit is None:
+                rows = conn.execute(SELECT_ALL, (session_id,)).fetchall()
+            else:
+                rows = conn.execute(SELECT_TAIL, (session_id, limit)).fetchall()
+                rows.reverse()
+        return [self.codec.decode(row[0]) for row in rows]
+
+    def _get_items_within_budget(self, session_id: str, token_budget: int,
+                                 limit: int | None) -> List[dict]:
+        backfill = []
+
+        def newest_first(cursor):
+            for row_id, data, tokens in cursor:
+                item = self.codec.decode(data)
+                if tokens is None:
+                    # Row written by SQLiteSession: count it once and remember.
+                    tokens = count_tokens(item)
+                    backfill.append((tokens, row_id))
+                yield item, tokens
+
+        with self.pool.connection() as conn:
+            cursor = conn.execute(SELECT_NEWEST_FIRST, (session_id,))
+            items = newest_within_budget(newest_first(cursor), token_budget, limit)
+            cursor.close()
+        if backfill:
+            with self.pool.transaction() as conn:
+                conn.executemany(SET_TOKEN_COUNT, backfill)
+        return items
+
+    def _add_items(self, session_id: str, items: List[dict]) -> None:
+        if not items:
+            return
+        with self.pool.transaction() as conn:
+            conn.execute(UPSERT_SESSION, (session_id,))
+            conn.executemany(INSERT_MESSAGE, self._rows(session_id, items))
+            conn.execute(TOUCH_SESSION, (session_id,))
+
+    def _add_items_many(self, batch: List[tuple[str, List[dict]]]) -> None:
+        """Write items for many sessions in a single transaction (one commit, one fsync)."""
+        if not batch:
+            return
+        with self.pool.transaction() as conn:
+            for session_id, items in batch:
+                conn.execute(UPSERT_SESSION, (session_id,))
+                conn.executemany(INSERT_MESSAGE, self._rows(session_id, items))
+                conn.execute(TOUCH_SESSION, (session_id,))
+
+    def _pop_item(self, session_id: str) -> dict | None:
+        with self.pool.transaction() as conn:
+            row = conn.execute(SELECT_LAST, (session_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute(DELETE_MESSAGE, (row[0],))
+        return self.codec.decode(row[1])
+
+    def _clear_session(self, session_id: str) -> None:
+        with self.pool.transaction() as conn:
+            conn.execute(DELETE_MESSAGES, (session_id,))
+            conn.execute(DELETE_SESSION, (session_id,))
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class PooledSession(Session):
+    """A `Session` that borrows connections from a `PooledSessionStore`.
+
+    With a `token_budget`, `get_items()` returns only the newest items that
+    fit the budget (tool calls stay paired with their outputs), so
+    `Runner.run` stops sending the whole history every turn. Token counts
+    are computed once when an item is added and stored next to it.
+    """
+
+    def __init__(self, session_id: str, store: PooledSessionStore, token_budget: int | None = None):
+        self.session_id = session_id
+        self.token_budget = token_budget
+        self._store = store
+
+    async def get_items(self, limit: int | None = None, *, token_budget: int | None = None) -> List[dict]:
+        token_budget = token_budget if token_budget is not None else self.token_budget
+        if token_budget is not None:
+            return await self._store._run(self._store._get_items_within_budget,
+                                          self.session_id, token_budget, limit)
+        return await self._store._run(self._store._get_items, self.session_id, limit)
+
+    async def add_items(self, items: List[dict]) -> None:
+        await self._store._run(self._store._add_items, self.session_id, list(items))
+
+    async def pop_item(self) -> dict | None:
+        return await self._store._run(self._store._pop_item, self.session_id)
+
+    async def clear_session(self) -> None:
+        await self._store._run(self._store._clear_session, self.session_id)
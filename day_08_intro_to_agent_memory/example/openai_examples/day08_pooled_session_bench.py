@@ -0,0 +1,53 @@
+"""Messages/sec for SupportBot-style traffic: fresh SQLiteSession per message vs. the pooled store.
+
+No model is called. Each simulated turn does what `Runner.run(..., session=...)`
+does to the session: read the history, then append the user and assistant items.
+
+    python day08_pooled_session_bench.py --turns 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from agents import SQLiteSession
+from day08_pooled_session import PooledSessionStore
+
+CONCURRENCY_LEVELS = [1, 10, 100]
+
+
+async def customer(session_for, customer_id: int, turns: int) -> None:
+    for turn in range(turns):
+        session = session_for(f"customer_{customer_id}")
+        await session.get_items()
+        await session.add_items([
+            {"role": "user", "content": f"Question {turn} about order #{customer_id}"},
+            {"role": "assistant", "content": f"Answer {turn}: your order #{customer_id} is on its way."},
+        ])
+
+
+async def measure(session_for, customers: int, turns: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(customer(session_for, c, turns) for c in range(customers)))
+    elapsed = time.perf_counter() - start
+    return customers * turns * 2 / elapsed  # two messages per turn
+
+
+async def main(turns: int) -> None:
+    print(f"{'customers':>10} {'fresh SQLiteSession':>22} {'PooledSessionStore':>20}")
+    for customers in CONCURRENCY_LEVELS:
+        with tempfile.TemporaryDirectory() as tmp:
+            fresh_db = os.path.join(tmp, "fresh.db")
+            fresh = await measure(lambda sid: SQLiteSession(sid, fresh_db), customers, turns)
+
+            store = PooledSessionStore(os.path.join(tmp, "pooled.db"))
+            pooled = await measure(store.session, customers, turns)
+            store.close()
+        print(f"{customers:>10} {fresh:>18.0f} msg/s {pooled:>16.0f} msg/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20, help="turns per customer")
+    asyncio.run(main(parser.parse_args().turns))
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import tracemalloc
+from collections import deque
+from itertools import islice
+from typing import List
+
+from agents.memory import Session  # protocol interface
+
+
+class RingBufferSession(Session):
+    """In-memory session capped by item count and by total (JSON) bytes.
+
+    The oldest items fall off the front once either cap is exceeded.
+    `get_items(limit)` walks only the last `limit` items and `pop_item`
+    is O(1), unlike the list in `day08_custom_session.py`.
+    """
+
+    def __init__(self, session_id: str, max_items: int = 200, max_bytes: int | None = 256 * 1024):
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        self.session_id = session_id
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._items = deque(maxlen=max_items)
+        self._sizes = deque(maxlen=max_items)
+        self._bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    async def get_items(self, limit: int | None = None) -> List[dict]:
+        if limit is None or limit >= len(self._items):
+            return list(self._items)
+        if limit <= 0:
+            return []
+        tail = list(islice(reversed(self._items), limit))
+        tail.reverse()
+        return tail
+
+    async def add_items(self, items: List[dict]) -> None:
+        for item in items:
+            size = len(json.dumps(item, separators=(",", ":")))
+            if len(self._items) == self.max_items:
+                # deque(maxlen) is about to drop the oldest item; keep the byte count in step.
+                self._bytes -= self._sizes[0]
+            self._items.append(item)
+            self._sizes.append(size)
+            self._bytes += size
+        if self.max_bytes is not None:
+            # Always keep the newest item, even if it alone is over the cap.
+            while self._bytes > self.max_bytes and len(self._items) > 1:
+                self._items.popleft()
+                self._bytes -= self._sizes.popleft()
+
+    async def pop_item(self) -> dict | None:
+        if not self._items:
+            return None
+        self._bytes -= self._sizes.pop()
+        return self._items.pop()
+
+    async def clear_session(self) -> None:
+        self._items.clear()
+        self._sizes.clear()
+        self._bytes = 0
+
+
+# Usage: memory per live session with 100k sessions holding a short conversation each
+async def main(sessions: int = 100_000, turns: int = 3):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    live = {}
+    for n in range(sessions):
+        session = RingBufferSession(f"customer_{n}", max_items=50)
+        for turn in range(turns):
+            await session.add_items([
+                {"role": "user", "content": f"Question {turn}"},
+                {"role": "assistant", "content": f"Answer {turn}"},
+            ])
+        live[session.session_id] = session
+
+    after = tracemalloc.take_snapshot()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    tracemalloc.stop()
+    print(f"{sessions} sessions x {turns * 2} items: {used / 2**20:.1f} MiB total, "
+          f"{used / sessions:.0f} bytes per session")
+
+if __name__ == "__main__":
+    asyncio.run(main())
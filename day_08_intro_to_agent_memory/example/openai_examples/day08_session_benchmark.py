@@ -0,0 +1,247 @@
+"""Benchmark suite for session backends, driven only through the Session protocol.
+
+Every backend is exercised with the same synthetic transcripts through
+`add_items`, `get_items(limit)`, `pop_item` and `clear_session`, so any class
+that implements the protocol can be compared. Results are printed as JSON
+(and optionally written to a file) so two runs can be diffed in CI.
+
+    python day08_session_benchmark.py                      # full size: 10k sessions, 1M items
+    python day08_session_benchmark.py --scale 0.01 --out results.json
+    python day08_session_benchmark.py --backends pooled,cached --scenarios write_heavy
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from agents import SQLiteSession
+from day08_cached_session import CachedSessionStore
+from day08_custom_session import MyCustomSession
+from day08_mmap_log_session import MmapLogStore
+from day08_pooled_session import PooledSessionStore
+from day08_ring_buffer_session import RingBufferSession
+
+# name -> (sessions, items in total, read share of operations, concurrent clients)
+SCENARIOS = {
+    "write_heavy": (10_000, 1_000_000, 0.1, 64),
+    "mixed": (10_000, 1_000_000, 0.5, 64),
+    "read_heavy": (10_000, 1_000_000, 0.9, 64),
+    "high_concurrency": (10_000, 200_000, 0.5, 1_000),
+}
+
+
+class Backend:
+    """Builds sessions for one run and cleans up afterwards."""
+
+    def __init__(self, make: Callable[[str, list], Callable[[str], object]], on_disk: bool):
+        self._make = make
+        self.on_disk = on_disk
+
+    def open(self, workdir: str):
+        self.workdir = workdir
+        self._closers = []
+        return self._make(workdir, self._closers)
+
+    def close(self) -> None:
+        for close in self._closers:
+            close()
+
+
+def _sqlite_session(workdir, closers):
+    path = os.path.join(workdir, "sqlite_session.db")
+    sessions = {}  # one SQLiteSession (and connection) per conversation, closed with the run
+
+    def session(sid):
+        if sid not in sessions:
+            sessions[sid] = SQLiteSession(sid, path)
+            closers.append(sessions[sid].close)
+        return sessions[sid]
+    return session
+
+
+def _pooled(workdir, closers):
+    store = PooledSessionStore(os.path.join(workdir, "pooled.db"))
+    closers.append(store.close)
+    return store.session
+
+
+def _cached(workdir, closers):
+    store = PooledSessionStore(os.path.join(workdir, "cached.db"))
+    closers.append(store.close)
+    return CachedSessionStore(store).session
+
+
+def _mmap_log(workdir, closers):
+    store = MmapLogStore(os.path.join(workdir, "logs"), grow_by=64 * 1024)
+    closers.append(store.close)
+    return store.session
+
+
+def _in_memory(cls):
+    def make(workdir, closers):
+        sessions = {}  # in-memory sessions live as long as the process keeps them
+
+        def session(sid):
+            if sid not in sessions:
+                sessions[sid] = cls(sid)
+            return sessions[sid]
+        return session
+    return make
+
+
+BACKENDS = {
+    "sqlite_session": Backend(_sqlite_session, on_disk=True),
+    "pooled": Backend(_pooled, on_disk=True),
+    "cached": Backend(_cached, on_disk=True),
+    "mmap_log": Backend(_mmap_log, on_disk=True),
+    "custom_list": Backend(_in_memory(MyCustomSession), on_disk=False),
+    "ring_buffer": Backend(_in_memory(RingBufferSession), on_disk=False),
+}
+
+
+def synthetic_turn(rng: random.Random, n: int) -> List[dict]:
+    words = rng.randint(5, 60)
+    return [
+        {"role": "user", "content": f"Question {n}: " + "lorem " * words},
+        {"role": "assistant", "content": [{"type": "output_text", "text": "ipsum " * (words * 2),
+                                           "annotations": []}]},
+    ]
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:  # not Linux: fall back to the peak
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def dir_bytes(path: str) -> int:
+    """Bytes actually allocated on disk; sparse, preallocated files (mmap_log) count only what is used."""
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            st = os.stat(os.path.join(root, name))
+            total += st.st_blocks * 512 if hasattr(st, "st_blocks") else st.st_size
+    return total
+
+
+def summarize(latencies: List[float]) -> dict:
+    if not latencies:
+        return {"count": 0}
+    latencies.sort()
+    return {
+        "count": len(latencies),
+        "p50_us": round(statistics.median(latencies) * 1e6, 1),
+        "p99_us": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6, 1),
+    }
+
+
+async def run_scenario(backend: Backend, sessions: int, items: int, read_share: float,
+                       clients: int, seed: int) -> dict:
+    workdir = tempfile.mkdtemp(prefix="session-bench-")
+    session_for = backend.open(workdir)
+    latencies = {"add_items": [], "get_items": [], "pop_item": [], "clear_session": []}
+    ids = [f"session_{n}" for n in range(sessions)]
+    turns_left = items // 2
+    rss_before = rss_bytes()
+
+    async def timed(op: str, call):
+        start = time.perf_counter()
+        result = await call
+        latencies[op].append(time.perf_counter() - start)
+        return result
+
+    async def client(worker: int):
+        nonlocal turns_left
+        local = random.Random(seed + worker)
+        while turns_left > 0:
+            session = session_for(local.choice(ids))
+            roll = local.random()
+            if roll < read_share:
+                await timed("get_items", session.get_items(limit=local.choice((None, 10, 50))))
+            elif roll < read_share + 0.01:
+                await timed("pop_item", session.pop_item())
+            elif roll < read_share + 0.012:
+                await timed("clear_session", session.clear_session())
+            else:
+                turns_left -= 1
+                await timed("add_items", session.add_items(synthetic_turn(local, turns_left)))
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(worker) for worker in range(clients)))
+        elapsed = time.perf_counter() - start
+
+        operations = sum(len(values) for values in latencies.values())
+        result = {
+            "elapsed_s": round(elapsed, 3),
+            "ops_per_s": round(operations / elapsed, 1),
+            "items_per_s": round(len(latencies["add_items"]) * 2 / elapsed, 1),
+            "rss_delta_bytes": rss_bytes() - rss_before,
+            "disk_bytes": dir_bytes(workdir) if backend.on_disk else 0,
+            "latency": {op: summarize(values) for op, values in latencies.items()},
+        }
+    finally:
+        backend.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+        gc.collect()
+    return result
+
+
+async def main(args) -> dict:
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "scale": args.scale,
+        "results": {},
+    }
+    for scenario in args.scenarios:
+        sessions, items, read_share, clients = SCENARIOS[scenario]
+        sessions = max(1, int(sessions * args.scale))
+        items = max(2, int(items * args.scale))
+        clients = max(1, min(clients, sessions))
+        for name in args.backends:
+            print(f"running {scenario} on {name} ({sessions} sessions, {items} items, {clients} clients)...",
+                  file=sys.stderr)
+            result = await run_scenario(BACKENDS[name], sessions, items, read_share, clients, args.seed)
+            result.update(sessions=sessions, items=items, read_share=read_share, clients=clients)
+            report["results"].setdefault(scenario, {})[name] = result
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", type=lambda s: s.split(","), default=list(BACKENDS),
+                        help=f"comma-separated, from: {', '.join(BACKENDS)}")
+    parser.add_argument("--scenarios", type=lambda s: s.split(","), default=list(SCENARIOS),
+                        help=f"comma-separated, from: {', '.join(SCENARIOS)}")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply sessions and items (e.g. 0.01 for a smoke run)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args()
+    for name in args.backends:
+        if name not in BACKENDS:
+            parser.error(f"unknown backend: {name}")
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario: {name}")
+
+    report = asyncio.run(main(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as out:
+            out.write(text)
@@ -0,0 +1,211 @@
+import json
+import struct
+import zlib
+from typing import Any
+
+try:
+    import zstandard
+except ImportError:  # zstd compression is optional
+    zstandard = None
+
+# Binary rows start with this byte; JSON text never does, which is how
+# old and new rows can live side by side in the same table.
+MAGIC = 0xB7
+VERSION = 1
+
+COMPRESS_NONE = 0
+COMPRESS_ZLIB = 1
+COMPRESS_ZSTD = 2
+
+# Value tags
+T_NONE, T_TRUE, T_FALSE, T_INT, T_FLOAT, T_STR, T_REF, T_LIST, T_DICT = range(9)
+
+# Strings that appear in almost every session item. They are written as a
+# two-byte reference instead of in full. Only ever append to this list:
+# the index is what gets stored on disk.
+COMMON_STRINGS = [
+    "role", "content", "user", "assistant", "system", "developer",
+    "type", "message", "function_call", "function_call_output", "call_id",
+    "name", "arguments", "output", "id", "status", "completed", "in_progress",
+    "text", "input_text", "output_text", "annotations", "refusal",
+    "title", "link", "description", "reasoning", "summary", "summary_text",
+]
+COMMON_INDEX = {s: i for i, s in enumerate(COMMON_STRINGS)}
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _pack(value: Any, out: bytearray) -> None:
+    if value is None:
+        out.append(T_NONE)
+    elif value is True:
+        out.append(T_TRUE)
+    elif value is False:
+        out.append(T_FALSE)
+    elif isinstance(value, int):
+        out.append(T_INT)
+        _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))  # zigzag
+    elif isinstance(value, float):
+        out.append(T_FLOAT)
+        out += struct.pack("<d", value)
+    elif isinstance(value, str):
+        ref = COMMON_INDEX.get(value)
+        if ref is not None:
+            out.append(T_REF)
+            out.append(ref)
+        else:
+            data = value.encode("utf-8")
+            out.append(T_STR)
+            _write_varint(out, len(data))
+            out += data
+    elif isinstance(value, (list, tuple)):
+        out.append(T_LIST)
+        _write_varint(out, len(value))
+        for element in value:
+            _pack(element, out)
+    elif isinstance(value, dict):
+        out.append(T_DICT)
+        _write_varint(out, len(value))
+        for key, element in value.items():
+            _pack(str(key), out)
+            _pack(element, out)
+    else:
+        raise TypeError(f"cannot encode {type(value).__name__} in a session item")
+
+
+def _unpack(buf: bytes, pos: int) -> tuple[Any, int]:
+    tag = buf[pos]
+    pos += 1
+    if tag == T_NONE:
+        return None, pos
+    if tag == T_TRUE:
+        return True, pos
+    if tag == T_FALSE:
+        return False, pos
+    if tag == T_INT:
+        n, pos = _read_varint(buf, pos)
+        return (n >> 1) if not n & 1 else -((n + 1) >> 1), pos
+    if tag == T_FLOAT:
+        return struct.unpack_from("<d", buf, pos)[0], pos + 8
+    if tag == T_STR:
+        size, pos = _read_varint(buf, pos)
+        return buf[pos:pos + size].decode("utf-8"), pos + size
+    if tag == T_REF:
+        return COMMON_STRINGS[buf[pos]], pos + 1
+    if tag == T_LIST:
+        count, pos = _read_varint(buf, pos)
+        items = []
+        for _ in range(count):
+            value, pos = _unpack(buf, pos)
+            items.append(value)
+        return items, pos
+    if tag == T_DICT:
+        count, pos = _read_varint(buf, pos)
+        obj = {}
+        for _ in range(count):
+            key, pos = _unpack(buf, pos)
+            obj[key], pos = _unpack(buf, pos)
+        return obj, pos
+    raise ValueError(f"corrupt session item: unknown tag {tag}")
+
+
+class JSONCodec:
+    """The SDK's own format: one JSON text value per item."""
+
+    def encode(self, item: dict) -> str:
+        return json.dumps(item)
+
+    def decode(self, data: str | bytes) -> dict:
+        if isinstance(data, bytes):
+            if data and data[0] == MAGIC:
+                return BinaryCodec.decode_binary(data)
+            data = data.decode("utf-8")
+        return json.loads(data)
+
+
+class BinaryCodec(JSONCodec):
+    """Compact tagged binary encoding with optional compression of large items.
+
+    Items whose encoding is at least `threshold` bytes are compressed with
+    zlib or zstd (zstd needs the `zstandard` package). Decoding still accepts
+    the JSON text rows written by `SQLiteSession`, so an existing database
+    keeps working and converts row by row as it is rewritten. Once a
+    database holds binary rows, the SDK's `SQLiteSession` can no longer read it.
+    """
+
+    def __init__(self, compression: str | None = "zlib", threshold: int = 512, level: int = 6):
+        if compression not in (None, "zlib", "zstd"):
+            raise ValueError(f"unknown compression: {compression!r}")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstd compression needs the 'zstandard' package: pip install zstandard")
+        self.compression = compression
+        self.threshold = threshold
+        self.level = level
+        if compression == "zstd":
+            self._zstd = zstandard.ZstdCompressor(level=level)
+
+    def encode(self, item: dict) -> bytes:
+        body = bytearray()
+        _pack(item, body)
+        flag = COMPRESS_NONE
+        if self.compression and len(body) >= self.threshold:
+            if self.compression == "zlib":
+                packed, candidate = zlib.compress(bytes(body), self.level), COMPRESS_ZLIB
+            else:
+                packed, candidate = self._zstd.compress(bytes(body)), COMPRESS_ZSTD
+            if len(packed) < len(body):
+                body, flag = packed, candidate
+        return bytes((MAGIC, (VERSION << 4) | flag)) + bytes(body)
+
+    @staticmethod
+    def decode_binary(data: bytes) -> dict:
+        flag = data[1] & 0x0F
+        body = data[2:]
+        if flag == COMPRESS_ZLIB:
+            body = zlib.decompress(body)
+        elif flag == COMPRESS_ZSTD:
+            if zstandard is None:
+                raise ImportError("this row is zstd-compressed: pip install zstandard")
+            body = zstandard.ZstdDecompressor().decompress(body)
+        value, _ = _unpack(body, 0)
+        return value
+
+
+def migrate(store, batch_size: int = 500) -> int:
+    """Re-encode JSON text rows with the store's codec, a small batch per transaction.
+
+    Safe to run while the store is serving traffic, and safe to stop and
+    re-run: rows that are already binary are skipped. Returns rows converted.
+    """
+    if not isinstance(store.codec, BinaryCodec):
+        raise ValueError("migrate() needs a store opened with a BinaryCodec")
+    converted = 0
+    while True:
+        with store.pool.transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, message_data FROM agent_messages WHERE typeof(message_data) = 'text' LIMIT ?",
+                (batch_size,),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE agent_messages SET message_data = ? WHERE id = ?",
+                [(store.codec.encode(json.loads(data)), row_id) for row_id, data in rows],
+            )
+        converted += len(rows)
+        if len(rows) < batch_size:
+            return converted
@@ -0,0 +1,114 @@
+"""On-disk size and encode/decode throughput of the session codecs on realistic transcripts.
+
+Each synthetic conversation mixes chat turns with `web_search` tool calls whose
+outputs are 10-result title/link/description lists, like the day07 examples.
+
+    python day08_session_codec_bench.py --sessions 200 --turns 20
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from day08_pooled_session import PooledSessionStore
+from day08_session_codec import BinaryCodec, JSONCodec, migrate, zstandard
+
+WORDS = ("coffee order shipping refund weather climate battery solar agent python "
+         "session memory search result price market update status account billing").split()
+
+
+def sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def make_transcript(rng: random.Random, turns: int) -> list[dict]:
+    items = []
+    for turn in range(turns):
+        items.append({"role": "user", "content": sentence(rng, rng.randint(5, 25))})
+        if rng.random() < 0.3:
+            call_id = f"call_{turn}_{rng.randrange(10**8)}"
+            query = sentence(rng, 4)
+            results = [
+                {
+                    "title": sentence(rng, 6),
+                    "link": f"https://www.example{rng.randrange(50)}.com/{rng.choice(WORDS)}/{rng.randrange(10**6)}",
+                    "description": sentence(rng, 30),
+                }
+                for _ in range(10)
+            ]
+            items.append({"type": "function_call", "call_id": call_id, "name": "web_search",
+                          "arguments": json.dumps({"query": query})})
+            items.append({"type": "function_call_output", "call_id": call_id, "output": json.dumps(results)})
+        items.append({
+            "id": f"msg_{rng.randrange(16**24):024x}",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": sentence(rng, rng.randint(20, 80)), "annotations": []}],
+        })
+    return items
+
+
+def codecs() -> dict:
+    options = {
+        "json (SDK default)": JSONCodec(),
+        "binary": BinaryCodec(compression=None),
+        "binary + zlib": BinaryCodec(compression="zlib"),
+    }
+    if zstandard is not None:
+        options["binary + zstd"] = BinaryCodec(compression="zstd")
+    return options
+
+
+def main(sessions: int, turns: int) -> None:
+    rng = random.Random(7)
+    transcripts = {f"customer_{n}": make_transcript(rng, turns) for n in range(sessions)}
+    items = [item for transcript in transcripts.values() for item in transcript]
+    raw_bytes = sum(len(json.dumps(item)) for item in items)
+    print(f"{sessions} sessions, {len(items)} items, {raw_bytes / 2**20:.1f} MiB of JSON\n")
+    print(f"{'codec':<20} {'on disk':>10} {'encode':>12} {'decode':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, codec in codecs().items():
+            start = time.perf_counter()
+            encoded = [codec.encode(item) for item in items]
+            encode_s = time.perf_counter() - start
+            start = time.perf_counter()
+            for data in encoded:
+                codec.decode(data)
+            decode_s = time.perf_counter() - start
+
+            path = os.path.join(tmp, f"{len(os.listdir(tmp))}.db")
+            store = PooledSessionStore(path, codec=codec)
+            store._add_items_many(list(transcripts.items()))
+            with store.pool.connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.execute("VACUUM")
+            store.close()
+
+            print(f"{name:<20} {os.path.getsize(path) / 2**20:>6.2f} MiB "
+                  f"{raw_bytes / encode_s / 2**20:>7.1f} MiB/s {raw_bytes / decode_s / 2**20:>7.1f} MiB/s")
+
+        # Migration: an SDK-format database converted in place.
+        path = os.path.join(tmp, "legacy.db")
+        legacy = PooledSessionStore(path)
+        legacy._add_items_many(list(transcripts.items()))
+        legacy.close()
+        store = PooledSessionStore(path, codec=BinaryCodec())
+        before = store._get_items("customer_0", None)
+        start = time.perf_counter()
+        converted = migrate(store)
+        elapsed = time.perf_counter() - start
+        assert store._get_items("customer_0", None) == before
+        store.close()
+        print(f"\nmigrated {converted} JSON rows to binary in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+    main(args.sessions, args.turns)
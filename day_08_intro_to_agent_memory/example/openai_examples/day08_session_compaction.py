@@ -0,0 +1,258 @@
+import asyncio
+import sqlite3
+import statistics
+import time
+from typing import List
+
+from day08_pooled_session import PooledSessionStore
+from day08_token_count import is_tool_call, is_tool_output
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archived_messages (
+    session_id TEXT NOT NULL,
+    message_data TEXT NOT NULL,
+    token_count INTEGER,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    reason TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_archived_messages_session_id ON archived_messages (session_id);
+"""
+
+OVERSIZED_SESSIONS = """
+SELECT session_id, COUNT(*) FROM agent_messages GROUP BY session_id HAVING COUNT(*) > ?
+"""
+
+
+class SessionCompactor:
+    """Background upkeep for a `PooledSessionStore`: expire, trim, archive and vacuum.
+
+    - Sessions idle for `idle_seconds`, or older than `ttl_seconds`, are removed.
+    - Sessions over `max_items_per_session` lose their oldest items.
+    - Removed rows are copied to `archive_path` first, when one is given.
+    - Freed pages go back to the OS with incremental vacuum steps.
+
+    Work is done in transactions of at most `batch_size` rows, on a worker
+    thread, so live `get_items`/`add_items` only ever wait for one short batch.
+    Every such write lock hold is recorded as a pause.
+    """
+
+    def __init__(self, store: PooledSessionStore, idle_seconds: float | None = 30 * 86400,
+                 ttl_seconds: float | None = None, max_items_per_session: int | None = None,
+                 archive_path: str | None = None, interval: float = 300.0, batch_size: int = 200,
+                 vacuum_pages: int = 500):
+        self.store = store
+        self.idle_seconds = idle_seconds
+        self.ttl_seconds = ttl_seconds
+        self.max_items_per_session = max_items_per_session
+        self.interval = interval
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self._archive = None
+        if archive_path:
+            self._archive = sqlite3.connect(archive_path, check_same_thread=False)
+            self._archive.executescript(ARCHIVE_SCHEMA)
+        self._task: asyncio.Task | None = None
+        self.counters = {
+            "runs": 0,
+            "sessions_expired": 0,
+            "items_trimmed": 0,
+            "items_archived": 0,
+            "bytes_reclaimed": 0,
+        }
+        self.pauses_ms: List[float] = []
+
+    def metrics(self) -> dict:
+        pauses = sorted(self.pauses_ms)
+        return {
+            **self.counters,
+            "pauses": len(pauses),
+            "pause_p50_ms": statistics.median(pauses) if pauses else 0.0,
+            "pause_p99_ms": pauses[int(len(pauses) * 0.99)] if pauses else 0.0,
+            "pause_max_ms": pauses[-1] if pauses else 0.0,
+        }
+
+    # --- scheduling -------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as exc:
+                print(f"Session compaction failed: {exc}")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> dict:
+        """One full pass. Each batch is a separate trip to the worker thread."""
+        if self.idle_seconds is not None or self.ttl_seconds is not None:
+            while await self.store._run(self._expire_batch):
+                await asyncio.sleep(0)
+        if self.max_items_per_session is not None:
+            for session_id, count in await self.store._run(self._oversized):
+                excess = count - self.max_items_per_session
+                while excess > 0:
+                    excess -= await self.store._run(self._trim_batch, session_id, min(excess, self.batch_size))
+                    await asyncio.sleep(0)
+        while await self.store._run(self._vacuum_step):
+            await asyncio.sleep(0)
+        await self.store._run(self._checkpoint)
+        self.counters["runs"] += 1
+        return self.metrics()
+
+    # --- worker-thread steps ---------------------------------------------
+
+    def _record_pause(self, started: float) -> None:
+        self.pauses_ms.append((time.perf_counter() - started) * 1000)
+        if len(self.pauses_ms) > 10_000:
+            del self.pauses_ms[:5_000]
+
+    def _archive_rows(self, rows: List[tuple], reason: str) -> None:
+        if self._archive is None or not rows:
+            return
+        # Committed before the live rows are deleted: a crash can only
+        # archive a row twice, never lose it.
+        self._archive.executemany(
+            "INSERT INTO archived_messages (session_id, message_data, token_count, created_at, reason) "
+            "VALUES (?, ?, ?, ?, ?)", [(*row, reason) for row in rows])
+        self._archive.commit()
+        self.counters["items_archived"] += len(rows)
+
+    def _expiry_condition(self) -> tuple[str, tuple]:
+        clauses, params = [], []
+        if self.idle_seconds is not None:
+            clauses.append("updated_at < datetime('now', ?)")
+            params.append(f"-{self.idle_seconds} seconds")
+        if self.ttl_seconds is not None:
+            clauses.append("created_at < datetime('now', ?)")
+            params.append(f"-{self.ttl_seconds} seconds")
+        return " OR ".join(clauses), tuple(params)
+
+    def _expire_batch(self) -> int:
+        """Archive and remove up to `batch_size` expired sessions; returns how many were selected.
+
+        Selecting, archiving and deleting happen under one write transaction,
+        so a session written to meanwhile is either selected with its new
+        rows or not selected at all, and nothing is archived that stays live.
+        """
+        condition, params = self._expiry_condition()
+        started = time.perf_counter()
+        with self.store.pool.transaction() as conn:
+            session_ids = [row[0] for row in conn.execute(
+                f"SELECT session_id FROM agent_sessions WHERE {condition} LIMIT ?", (*params, self.batch_size))]
+            if not session_ids:
+                return 0
+            marks = ",".join("?" * len(session_ids))
+            rows = conn.execute(
+                f"SELECT session_id, message_data, token_count, created_at FROM agent_messages "
+                f"WHERE session_id IN ({marks}) ORDER BY id", session_ids).fetchall()
+            self._archive_rows(rows, "expired")
+            conn.execute(f"DELETE FROM agent_messages WHERE session_id IN ({marks})", session_ids)
+            conn.execute(f"DELETE FROM agent_sessions WHERE session_id IN ({marks})", session_ids)
+        self._record_pause(started)
+        self.counters["sessions_expired"] += len(session_ids)
+        return len(session_ids)
+
+    def _oversized(self) -> List[tuple[str, int]]:
+        with self.store.pool.connection() as conn:
+            return conn.execute(OVERSIZED_SESSIONS, (self.max_items_per_session,)).fetchall()
+
+    def _trim_batch(self, session_id: str, count: int) -> int:
+        with self.store.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT id, session_id, message_data, token_count, created_at FROM agent_messages "
+                "WHERE session_id = ? ORDER BY id ASC LIMIT ?", (session_id, count)).fetchall()
+            if not rows:
+                return count  # someone else emptied it; nothing left to trim
+            rows = self._pair_safe_prefix(conn, session_id, rows)
+        self._archive_rows([row[1:] for row in rows], "trimmed")
+        started = time.perf_counter()
+        with self.store.pool.transaction() as conn:
+            conn.executemany("DELETE FROM agent_messages WHERE id = ?", [(row[0],) for row in rows])
+        self._record_pause(started)
+        self.counters["items_trimmed"] += len(rows)
+        return len(rows)
+
+    def _pair_safe_prefix(self, conn, session_id: str, rows: List[tuple]) -> List[tuple]:
+        """Shorten (or, if it would be empty, extend) `rows` to end on a tool call/output pair boundary.
+
+        Trimming a tool call but not its output would leave the session
+        opening with an orphaned output, which the model APIs reject.
+        """
+        tail = conn.execute(
+            "SELECT id, session_id, message_data, token_count, created_at FROM agent_messages "
+            "WHERE session_id = ? AND id > ? ORDER BY id ASC", (session_id, rows[-1][0])).fetchall()
+        every = rows + tail
+        items = [self.store.codec.decode(row[2]) for row in every]
+        cut = len(rows)
+        while cut > 0:
+            tail_outputs = {item["call_id"] for item in items[cut:] if is_tool_output(item)}
+            split = [index for index, item in enumerate(items[:cut])
+                     if is_tool_call(item) and item["call_id"] in tail_outputs]
+            if not split:
+                return every[:cut]
+            cut = split[0]
+        # The oldest item is a call whose output comes later: trim through
+        # the end of that exchange instead, so trimming always makes progress.
+        cut = 1
+        while True:
+            open_calls = {item["call_id"] for item in items[:cut] if is_tool_call(item)}
+            open_calls -= {item["call_id"] for item in items[:cut] if is_tool_output(item)}
+            pending = [index for index, item in enumerate(items[cut:], cut)
+                       if is_tool_output(item) and item["call_id"] in open_calls]
+            if not pending:
+                return every[:cut]
+            cut = pending[-1] + 1
+
+    def _vacuum_step(self) -> bool:
+        """Release up to `vacuum_pages` free pages; True while more remain."""
+        with self.store.pool.connection() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                return False  # not an incremental-vacuum database; see convert_to_incremental()
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            before = conn.execute("PRAGMA page_count").fetchone()[0]
+            if conn.execute("PRAGMA freelist_count").fetchone()[0] == 0:
+                return False
+            started = time.perf_counter()
+            conn.execute(f"PRAGMA incremental_vacuum({self.vacuum_pages})").fetchall()
+            self._record_pause(started)
+            after = conn.execute("PRAGMA page_count").fetchone()[0]
+            self.counters["bytes_reclaimed"] += (before - after) * page_size
+            return after < before and conn.execute("PRAGMA freelist_count").fetchone()[0] > 0
+
+    def _checkpoint(self) -> None:
+        with self.store.pool.connection() as conn:
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+
+    def convert_to_incremental(self) -> None:
+        """One-off, blocking: switch a database created by `SQLiteSession` to incremental vacuum."""
+        with self.store.pool.connection() as conn:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+
+
+# Usage
+async def main():
+    store = PooledSessionStore("support_conversations.db")
+    compactor = SessionCompactor(store, idle_seconds=30 * 86400, max_items_per_session=200,
+                                 archive_path="support_conversations_archive.db", interval=600)
+    print(await compactor.run_once())
+    # In a long-running service, call compactor.start() once instead: it
+    # repeats the pass every `interval` seconds alongside normal traffic.
+    await compactor.stop()
+    store.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
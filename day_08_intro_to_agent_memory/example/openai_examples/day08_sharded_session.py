@@ -0,0 +1,225 @@
+import asyncio
+import bisect
+import hashlib
+import os
+import tempfile
+import time
+from typing import List
+
+from agents.memory import Session  # protocol interface
+from day08_pooled_session import PooledSessionStore
+
+LOCK_STRIPES = 1024
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class ConsistentHashRing:
+    """Maps keys to shard numbers; growing from N to N+1 shards moves only ~1/(N+1) of the keys."""
+
+    def __init__(self, shards: int, vnodes: int = 128):
+        points = sorted((_hash(f"shard-{shard}#{v}"), shard) for shard in range(shards) for v in range(vnodes))
+        self._hashes = [h for h, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, key: str) -> int:
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._shards[index]
+
+
+class ShardedSessionStore:
+    """Spreads sessions over N SQLite files, each with its own pool and writer lock.
+
+    `session_id` is routed by consistent hashing. `resize()` adds shards
+    online: the new ring takes effect at once, the sessions whose owner
+    changed are moved in the background, and any session touched before its
+    turn (including one created mid-resize) is moved first, on demand.
+    """
+
+    def __init__(self, db_prefix: str = "support_conversations", shards: int = 4,
+                 max_connections: int = 4, codec=None):
+        self.db_prefix = db_prefix
+        self.max_connections = max_connections
+        self.codec = codec
+        self.shards: List[PooledSessionStore] = []
+        self._add_shards(shards)
+        self.ring = ConsistentHashRing(shards)
+        self._old_ring: ConsistentHashRing | None = None  # set until a resize has moved everything
+        self._old_count = shards
+        self._resizing = False
+        self._settled: set[str] = set()  # sessions already on their new shard during a resize
+        self._locks = [asyncio.Lock() for _ in range(LOCK_STRIPES)]
+        self.reads = [0] * shards
+        self.writes = [0] * shards
+        self.moved = 0
+
+    def _add_shards(self, total: int) -> None:
+        for index in range(len(self.shards), total):
+            self.shards.append(PooledSessionStore(f"{self.db_prefix}_shard{index}.db",
+                                                  max_connections=self.max_connections, codec=self.codec))
+
+    def session(self, session_id: str, token_budget: int | None = None) -> "ShardedSession":
+        return ShardedSession(session_id, self, token_budget=token_budget)
+
+    def _lock_for(self, session_id: str) -> asyncio.Lock:
+        return self._locks[_hash(session_id) % LOCK_STRIPES]
+
+    async def _route(self, session_id: str) -> int:
+        """Shard that owns `session_id`; the caller holds its lock."""
+        target = self.ring.shard_for(session_id)
+        if self._old_ring is not None and session_id not in self._settled:
+            source = self._old_ring.shard_for(session_id)
+            if source != target:
+                await self._move(session_id, source, target)
+            self._settled.add(session_id)
+        return target
+
+    async def call(self, session_id: str, method: str, *args, write: bool = False):
+        async with self._lock_for(session_id):
+            shard = await self._route(session_id)
+            if write:
+                self.writes[shard] += 1
+            else:
+                self.reads[shard] += 1
+            store = self.shards[shard]
+            return await store._run(getattr(store, method), session_id, *args)
+
+    async def _move(self, session_id: str, source: int, target: int) -> None:
+        if await asyncio.to_thread(_copy_session, self.shards[source], self.shards[target], session_id):
+            self.moved += 1
+
+    async def resize(self, shards: int) -> None:
+        """Grow to `shards` files and move the sessions whose owner changed.
+
+        If moving fails part way, the store stays in resize mode: sessions
+        not moved yet are still found on their old shard (and moved on first
+        touch), and calling `resize` again with the same count finishes the job.
+        """
+        if self._resizing:
+            raise RuntimeError("a resize is already running")
+        if self._old_ring is None:
+            if shards <= len(self.shards):
+                raise ValueError("shards can only be added")
+            old_count = len(self.shards)
+            self._add_shards(shards)
+            self.reads += [0] * (shards - old_count)
+            self.writes += [0] * (shards - old_count)
+            # Switch routing first: from here on every call settles its session on the
+            # new shard before touching it, so nothing is written behind a copy.
+            self._old_ring, self._old_count, self.ring = self.ring, old_count, ConsistentHashRing(shards)
+        elif shards != len(self.shards):
+            raise RuntimeError(f"finish the interrupted resize first: resize({len(self.shards)})")
+        self._resizing = True
+        try:
+            for source in range(self._old_count):
+                for session_id in await asyncio.to_thread(_session_ids, self.shards[source]):
+                    if self._old_ring.shard_for(session_id) != source:
+                        continue  # left over from an interrupted move; the owner's copy wins
+                    if self.ring.shard_for(session_id) == source or session_id in self._settled:
+                        continue
+                    async with self._lock_for(session_id):
+                        await self._route(session_id)
+        finally:
+            self._resizing = False
+        # Only a complete scan ends resize mode; until then the old ring is still needed.
+        self._old_ring = None
+        self._settled.clear()
+
+    def stats(self) -> List[dict]:
+        result = []
+        for index, store in enumerate(self.shards):
+            with store.pool.connection() as conn:
+                sessions = conn.execute("SELECT COUNT(*) FROM agent_sessions").fetchone()[0]
+                items = conn.execute("SELECT COUNT(*) FROM agent_messages").fetchone()[0]
+            size = sum(os.path.getsize(path) for path in (store.db_path, store.db_path + "-wal")
+                       if os.path.exists(path))
+            result.append({"shard": index, "path": store.db_path, "sessions": sessions, "items": items,
+                           "bytes": size, "reads": self.reads[index], "writes": self.writes[index]})
+        return result
+
+    def close(self) -> None:
+        for store in self.shards:
+            store.close()
+
+
+def _session_ids(store: PooledSessionStore) -> List[str]:
+    with store.pool.connection() as conn:
+        return [row[0] for row in conn.execute("SELECT session_id FROM agent_sessions")]
+
+
+def _copy_session(source: PooledSessionStore, target: PooledSessionStore, session_id: str) -> bool:
+    # Rows are copied as stored (already encoded), then removed from the source.
+    # The target side replaces whatever it has, so a move interrupted between
+    # the two transactions can simply be run again.
+    with source.pool.connection() as conn:
+        session = conn.execute("SELECT created_at, updated_at FROM agent_sessions WHERE session_id = ?",
+                               (session_id,)).fetchone()
+        rows = conn.execute("SELECT message_data, token_count, created_at FROM agent_messages "
+                            "WHERE session_id = ? ORDER BY id ASC", (session_id,)).fetchall()
+    if session is None:
+        return False
+    with target.pool.transaction() as conn:
+        conn.execute("DELETE FROM agent_messages WHERE session_id = ?", (session_id,))
+        conn.execute("INSERT OR REPLACE INTO agent_sessions (session_id, created_at, updated_at) VALUES (?, ?, ?)",
+                     (session_id, *session))
+        conn.executemany("INSERT INTO agent_messages (session_id, message_data, token_count, created_at) "
+                         "VALUES (?, ?, ?, ?)", [(session_id, *row) for row in rows])
+    source._clear_session(session_id)
+    return True
+
+
+class ShardedSession(Session):
+    """A `Session` routed to its shard on every call."""
+
+    def __init__(self, session_id: str, store: ShardedSessionStore, token_budget: int | None = None):
+        self.session_id = session_id
+        self.token_budget = token_budget
+        self._store = store
+
+    async def get_items(self, limit: int | None = None, *, token_budget: int | None = None) -> List[dict]:
+        token_budget = token_budget if token_budget is not None else self.token_budget
+        if token_budget is not None:
+            return await self._store.call(self.session_id, "_get_items_within_budget", token_budget, limit)
+        return await self._store.call(self.session_id, "_get_items", limit)
+
+    async def add_items(self, items: List[dict]) -> None:
+        await self._store.call(self.session_id, "_add_items", list(items), write=True)
+
+    async def pop_item(self) -> dict | None:
+        return await self._store.call(self.session_id, "_pop_item", write=True)
+
+    async def clear_session(self) -> None:
+        await self._store.call(self.session_id, "_clear_session", write=True)
+
+
+# Usage: write throughput at 1, 2, 4 and 8 shards, then grow 4 -> 6 online
+async def main(customers: int = 400, turns: int = 10):
+    async def customer(store: ShardedSessionStore, n: int):
+        session = store.session(f"customer_{n}")
+        for turn in range(turns):
+            await session.add_items([
+                {"role": "user", "content": f"Question {turn}"},
+                {"role": "assistant", "content": f"Answer {turn}"},
+            ])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for shards in (1, 2, 4, 8):
+            store = ShardedSessionStore(os.path.join(tmp, f"bench{shards}"), shards=shards)
+            start = time.perf_counter()
+            await asyncio.gather(*(customer(store, n) for n in range(customers)))
+            elapsed = time.perf_counter() - start
+            print(f"{shards} shard(s): {customers * turns * 2 / elapsed:,.0f} items/s")
+            store.close()
+
+        store = ShardedSessionStore(os.path.join(tmp, "grow"), shards=4)
+        await asyncio.gather(*(customer(store, n) for n in range(customers)))
+        await asyncio.gather(store.resize(6), *(customer(store, n) for n in range(0, customers, 10)))
+        print(f"\nresized 4 -> 6 shards, moved {store.moved} of {customers} sessions")
+        for shard in store.stats():
+            print(shard)
+        store.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
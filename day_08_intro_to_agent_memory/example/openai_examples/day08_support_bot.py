@@ -1,15 +1,18 @@
 import asyncio
-from agents import Agent, Runner, SQLiteSession
+from agents import Agent, Runner
+from day08_pooled_session import PooledSessionStore
 
 class SupportBot:
-    def __init__(self):
+    def __init__(self, db_path: str = "support_conversations.db"):
+        # One shared store (and connection pool) for every customer
+        self.store = PooledSessionStore(db_path)
         self.agent = Agent(
             name="SupportBot",
             instructions="You are a helpful customer support agent. Be polite and remember conversation history for each user."
         )
 
     def session_for(self, customer_id: str):
-        return SQLiteSession(f"customer_{customer_id}", "support_conversations.db")
+        return self.store.session(f"customer_{customer_id}")
 
     async def chat(self, customer_id: str, message: str):
         session = self.session_for(customer_id)
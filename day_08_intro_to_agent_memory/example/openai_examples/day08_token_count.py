@@ -0,0 +1,78 @@
+from typing import List
+
+try:
+    import tiktoken
+except ImportError:  # fall back to a character-based estimate
+    tiktoken = None
+
+# Rough per-item framing cost (role markers, separators) on top of the text.
+ITEM_OVERHEAD = 4
+
+_encoding = None
+
+
+def _text_of(value) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return " ".join(_text_of(part) for part in value)
+    if isinstance(value, dict):
+        return " ".join(_text_of(value[key]) for key in ("text", "content", "arguments", "output", "name")
+                        if key in value)
+    return ""
+
+
+def count_tokens(item: dict) -> int:
+    """Approximate prompt tokens for one session item.
+
+    Uses tiktoken's o200k_base encoding when it is installed, otherwise
+    about four characters per token.
+    """
+    global _encoding
+    text = _text_of(item)
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("o200k_base")
+        return ITEM_OVERHEAD + len(_encoding.encode(text, disallowed_special=()))
+    return ITEM_OVERHEAD + (len(text) + 3) // 4
+
+
+def is_tool_output(item: dict) -> bool:
+    return "call_id" in item and str(item.get("type", "")).endswith("_output")
+
+
+def is_tool_call(item: dict) -> bool:
+    return "call_id" in item and not is_tool_output(item)
+
+
+def newest_within_budget(rows, token_budget: int, limit: int | None = None) -> List[dict]:
+    """Pick the newest items that fit `token_budget`, oldest first.
+
+    `rows` yields `(item, token_count)` newest first. A tool call and its
+    output are kept or dropped together: walking backwards, an output opens
+    a group that only closes once its call has been seen, and a group is
+    accepted whole or not at all, so the result never holds an orphan.
+    """
+    selected: List[dict] = []
+    used = 0
+    group: List[dict] = []
+    group_tokens = 0
+    open_calls: set = set()
+    for item, tokens in rows:
+        group.append(item)
+        group_tokens += tokens
+        if is_tool_output(item):
+            open_calls.add(item["call_id"])
+        elif is_tool_call(item):
+            open_calls.discard(item["call_id"])
+        if open_calls:
+            continue
+        if used + group_tokens > token_budget:
+            break
+        if limit is not None and len(selected) + len(group) > limit:
+            break
+        selected.extend(group)
+        used += group_tokens
+        group, group_tokens = [], 0
+    selected.reverse()
+    return selected
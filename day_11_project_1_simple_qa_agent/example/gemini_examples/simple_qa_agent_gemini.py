@@ -1,5 +1,6 @@
 import os
-import requests
+import time
+import httpx
 from agents import Agent, Runner, SQLiteSession, OpenAIChatCompletionsModel
 from agents import function_tool
 from openai import AsyncOpenAI
@@ -24,8 +25,15 @@ model = OpenAIChatCompletionsModel(
 )
 
 # --- 1. Initialize the Tool ---
+SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+API_KEY = os.environ.get("GOOGLE_API_KEY", "GOOGLE_API_KEY")
+CX = os.environ.get("SEARCH_ENGINE_ID", "Search_Engine_Id")
+SEARCH_CACHE_TTL = 600  # seconds a repeated query is answered from memory
+_search_cache: dict[str, tuple[float, list[dict]]] = {}  # normalized query -> (expires_at, results)
+
+
 @function_tool
-def web_search(query: str):
+async def web_search(query: str) -> list[dict]:
     """
     Performs a web search using Google Custom Search API.
 
@@ -34,23 +42,23 @@ def web_search(query: str):
     Returns:
         List of dictionaries containing title, link, and description.
     """
-
-    API_KEY = "GOOGLE_API_KEY"
-    CX = "Search_Engine_Id"
-    num_results = 10  # max 10 per request
-
-    url = f"https://www.googleapis.com/customsearch/v1?q={query}&key={API_KEY}&cx={CX}&num={num_results}"
-
-    response = requests.get(url)
-    data = response.json()
-
-    results = []
-    for item in data.get("items", []):
-        results.append({
-            "title": item.get("title"),
-            "link": item.get("link"),
-            "description": item.get("snippet")
-        })
+    key = " ".join(query.casefold().split())
+    cached = _search_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    # Async, so the agent's event loop keeps running during the request; httpx
+    # URL-encodes the query and the timeout bounds a stuck connection.
+    async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=3.0)) as http:
+        response = await http.get(SEARCH_URL, params={"q": query, "key": API_KEY, "cx": CX, "num": 10})
+    response.raise_for_status()
+    results = [
+        {"title": item.get("title"), "link": item.get("link"), "description": item.get("snippet")}
+        for item in response.json().get("items", [])
+    ]
+    _search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL, results)
+    while len(_search_cache) > 256:
+        del _search_cache[next(iter(_search_cache))]  # oldest first
     return results
 
 web_search_tool = web_search
@@ -59,7 +67,7 @@ print("WebSearchTool initialized.")
 # --- 2. Define the Agent ---
 qa_agent = Agent(
     name="KnowledgeAgent",
-    instructions="You are a helpful and knowledgeable assistant. Use the web search tool to find answers to questions. If you cannot find an answer, politely state that you don't know.",
+    instructions="You are a helpful and knowledgeable assistant. Use the web search tool to find answers to questions and cite the link of the result you used. If you cannot find an answer, politely state that you don't know.",
     tools=[web_search_tool],
     model=model # Pass the Gemini model to the agent
 )
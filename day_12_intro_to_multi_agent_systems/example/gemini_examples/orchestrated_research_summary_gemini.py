@@ -1,4 +1,7 @@
 import asyncio
+import os
+import time
+import httpx
 from agents import Agent, Runner, SQLiteSession, trace, function_tool, OpenAIChatCompletionsModel
 from openai import AsyncOpenAI
 
@@ -15,30 +18,40 @@ model = OpenAIChatCompletionsModel(
 
 # Optional WebSearchTool (only if available in your env)
 # For Gemini, we'll use a custom web_search function as seen in Day 7
-import requests
+SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+API_KEY = os.environ.get("GOOGLE_API_KEY", "GOOGLE_API_KEY")
+CX = os.environ.get("SEARCH_ENGINE_ID", "Search_Engine_Id")
+SEARCH_CACHE_TTL = 600  # seconds a repeated query is answered from memory
+_search_cache: dict[str, tuple[float, list[dict]]] = {}  # normalized query -> (expires_at, results)
+
 
 @function_tool
-def web_search(query: str):
+async def web_search(query: str) -> list[dict]:
     """
     Performs a web search using Google Custom Search API.
+
     Args:
         query: The search query.
     Returns:
         List of dictionaries containing title, link, and description.
     """
-    API_KEY = "GOOGLE_API_KEY"
-    CX = "Search_Engine_Id"
-    num_results = 10
-    url = f"https://www.googleapis.com/customsearch/v1?q={query}&key={API_KEY}&cx={CX}&num={num_results}"
-    response = requests.get(url)
-    data = response.json()
-    results = []
-    for item in data.get("items", []):
-        results.append({
-            "title": item.get("title"),
-            "link": item.get("link"),
-            "description": item.get("snippet")
-        })
+    key = " ".join(query.casefold().split())
+    cached = _search_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    # Async, so the agent's event loop keeps running during the request; httpx
+    # URL-encodes the query and the timeout bounds a stuck connection.
+    async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=3.0)) as http:
+        response = await http.get(SEARCH_URL, params={"q": query, "key": API_KEY, "cx": CX, "num": 10})
+    response.raise_for_status()
+    results = [
+        {"title": item.get("title"), "link": item.get("link"), "description": item.get("snippet")}
+        for item in response.json().get("items", [])
+    ]
+    _search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL, results)
+    while len(_search_cache) > 256:
+        del _search_cache[next(iter(_search_cache))]  # oldest first
     return results
 
 # --- Specialists ---
@@ -48,8 +61,8 @@ researcher = Agent(
     handoff_description="Finds current, credible information from the web (or summarizes known info if web search is unavailable).",
     instructions=(
         "Collect relevant facts, stats, and sources about the user's topic. "
-        "If WebSearchTool is available, use it. "
-        "Return a short bullet list of key findings and any sources."
+        "Use the web_search tool to find current information. "
+        "Return a short bullet list of key findings, each citing the link of the result it came from."
     ),
     tools=[web_search], # Using custom web_search function
     model=model
@@ -0,0 +1,263 @@
+import asyncio
+import sqlite3
+import threading
+from typing import Awaitable, Callable, List
+
+from agents import Agent, Runner, SQLiteSession
+from agents.memory import Session  # protocol interface
+
+
+# Agent for summarization
+summarizer_agent = Agent(
+    name="Summarizer",
+    instructions=(
+        "You are an expert summarizer. You will be given an existing summary of a conversation "
+        "and the messages that came after it. Return one updated, concise summary that keeps all "
+        "key information and decisions."
+    ),
+)
+
+
+def item_text(item: dict) -> str:
+    content = item.get("content")
+    if isinstance(content, list):
+        content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    if content:
+        return f"{item.get('role', 'assistant')}: {content}"
+    if item.get("type") == "function_call":
+        return f"tool call {item.get('name')}({item.get('arguments')})"
+    if item.get("type") == "function_call_output":
+        return f"tool result: {item.get('output')}"
+    return ""
+
+
+def is_tool_output(item: dict) -> bool:
+    return "call_id" in item and str(item.get("type", "")).endswith("_output")
+
+
+def is_tool_call(item: dict) -> bool:
+    return "call_id" in item and not is_tool_output(item)
+
+
+def pair_safe_cut(items: List[dict], cut: int) -> int:
+    """Move `cut` back until no tool call in `items[:cut]` has its output in `items[cut:]`.
+
+    The kept tail must never open with a tool output whose call was folded
+    into the summary; the model APIs reject such a history.
+    """
+    while cut > 0:
+        tail_outputs = {item["call_id"] for item in items[cut:] if is_tool_output(item)}
+        split = [index for index, item in enumerate(items[:cut])
+                 if is_tool_call(item) and item["call_id"] in tail_outputs]
+        if not split:
+            break
+        cut = split[0]
+    return cut
+
+
+async def summarize_with_agent(previous_summary: str | None, new_items: List[dict]) -> str:
+    """Default summarizer: fold only the new items into the previous summary."""
+    transcript = "\n".join(filter(None, (item_text(item) for item in new_items)))
+    prompt = (
+        f"Existing summary:\n{previous_summary or '(none yet)'}\n\n"
+        f"New messages:\n{transcript}\n\n"
+        "Return the updated summary."
+    )
+    result = await Runner.run(summarizer_agent, prompt)
+    return result.final_output
+
+
+class SummaryCheckpoints:
+    """Summary text plus its high-water mark (items covered so far), one row per session."""
+
+    def __init__(self, db_path: str):
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS session_summaries (
+                    session_id TEXT PRIMARY KEY,
+                    summary TEXT,
+                    high_water_mark INTEGER NOT NULL DEFAULT 0,
+                    total_items INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )"""
+            )
+            self._conn.commit()
+
+    def load(self, session_id: str) -> tuple[str | None, int, int] | None:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT summary, high_water_mark, total_items FROM session_summaries WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+
+    def save(self, session_id: str, summary: str | None, high_water_mark: int, total_items: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO session_summaries (session_id, summary, high_water_mark, total_items)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(session_id) DO UPDATE SET
+                       summary = excluded.summary,
+                       high_water_mark = excluded.high_water_mark,
+                       total_items = excluded.total_items,
+                       updated_at = CURRENT_TIMESTAMP""",
+                (session_id, summary, high_water_mark, total_items),
+            )
+            self._conn.commit()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM session_summaries WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+
+class RollingSummarySession(Session):
+    """Wraps any session and serves "summary + recent tail" from `get_items`.
+
+    Everything before the high-water mark is represented by one summary
+    item; only the items after it are read from the wrapped session. Once
+    `summarize_every` items have piled up beyond the `keep_last` tail, the
+    delta is folded into the summary by a background task, so the request
+    path never waits for the summarizer and never re-reads the full history.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        db_path: str = "chat_history.db",
+        summarizer: Callable[[str | None, List[dict]], Awaitable[str]] = summarize_with_agent,
+        keep_last: int = 6,
+        summarize_every: int = 8,
+    ):
+        self.session_id = session.session_id
+        self._session = session
+        self._checkpoints = SummaryCheckpoints(db_path)
+        self._summarizer = summarizer
+        self.keep_last = keep_last
+        self.summarize_every = summarize_every
+        self._summary: str | None = None
+        self._high_water_mark = 0
+        self._total_items: int | None = None
+        self._generation = 0  # bumped by pop/clear so a stale summary is never saved
+        # Item counts and reads of the wrapped session happen under this lock, so
+        # "the last N items" always means the N items after the high-water mark.
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def _load(self) -> None:
+        if self._total_items is not None:
+            return
+        row = await asyncio.to_thread(self._checkpoints.load, self.session_id)
+        if row is None:
+            # First time we see this session: count what is already there, once.
+            self._total_items = len(await self._session.get_items())
+            await self._save()
+        else:
+            self._summary, self._high_water_mark, self._total_items = row
+
+    async def _save(self) -> None:
+        await asyncio.to_thread(self._checkpoints.save, self.session_id, self._summary,
+                                self._high_water_mark, self._total_items)
+
+    def _summary_item(self) -> dict:
+        return {"role": "system", "content": f"Summary of the earlier conversation: {self._summary}"}
+
+    async def get_items(self, limit: int | None = None) -> List[dict]:
+        async with self._lock:
+            await self._load()
+            tail_size = self._total_items - self._high_water_mark
+            tail = await self._session.get_items(limit=tail_size) if tail_size > 0 else []
+            items = ([self._summary_item()] if self._summary else []) + tail
+        return items[-limit:] if limit else items
+
+    async def add_items(self, items: List[dict]) -> None:
+        async with self._lock:
+            await self._load()
+            await self._session.add_items(items)
+            self._total_items += len(items)
+            await self._save()
+            unsummarized = self._total_items - self._high_water_mark - self.keep_last
+        if unsummarized >= self.summarize_every and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._summarize_delta())
+
+    async def _summarize_delta(self) -> None:
+        async with self._lock:
+            generation = self._generation
+            delta_size = self._total_items - self._high_water_mark - self.keep_last
+            if delta_size <= 0:
+                return
+            unsummarized = await self._session.get_items(limit=self._total_items - self._high_water_mark)
+        delta_size = pair_safe_cut(unsummarized, delta_size)
+        if delta_size <= 0:
+            return  # the whole delta belongs to a call still waiting on its output
+        delta = unsummarized[:delta_size]
+        try:
+            summary = await self._summarizer(self._summary, delta)
+        except Exception as exc:
+            print(f"Summarizing {self.session_id} failed, keeping the old checkpoint: {exc}")
+            return
+        async with self._lock:
+            if generation != self._generation:
+                return  # history was rewritten while we were summarizing
+            # Adds only append, so the delta still starts at the high-water mark.
+            self._summary = summary
+            self._high_water_mark += delta_size
+            await self._save()
+
+    async def wait_for_summary(self) -> None:
+        """Wait for a background summarization, if one is running."""
+        if self._task is not None:
+            await self._task
+
+    async def pop_item(self) -> dict | None:
+        async with self._lock:
+            await self._load()
+            item = await self._session.pop_item()
+            if item is None:
+                return None
+            self._generation += 1
+            self._total_items -= 1
+            if self._total_items < self._high_water_mark:
+                # The summary covers the popped item; drop it and let it rebuild.
+                self._summary, self._high_water_mark = None, 0
+            await self._save()
+            return item
+
+    async def clear_session(self) -> None:
+        async with self._lock:
+            self._generation += 1
+            await self._session.clear_session()
+            await asyncio.to_thread(self._checkpoints.delete, self.session_id)
+            self._summary, self._high_water_mark, self._total_items = None, 0, 0
+
+
+# Usage
+chat_agent = Agent(
+    name="ChatAssistant",
+    instructions="You are a helpful chat assistant. Keep responses brief.",
+)
+
+async def main():
+    session = RollingSummarySession(SQLiteSession("user_123_long_chat", "chat_history.db"),
+                                    keep_last=4, summarize_every=4)
+    await session.clear_session()  # Start fresh
+
+    for message in [
+        "Hi, I need help with my order.",
+        "My order number is #12345. It hasn't arrived yet.",
+        "It was placed on October 26th.",
+        "Can you check the status?",
+        "What is the next step for my order?",
+    ]:
+        result = await Runner.run(chat_agent, message, session=session)
+        print(f"User: {message}\nAgent: {result.final_output}\n")
+
+    await session.wait_for_summary()
+    items = await session.get_items()
+    print(f"Next turn sends {len(items)} items instead of the full history:")
+    for item in items:
+        print(" ", str(item)[:100])
+
+if __name__ == "__main__":
+    asyncio.run(main())
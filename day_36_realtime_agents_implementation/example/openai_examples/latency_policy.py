@@ -0,0 +1,210 @@
+import asyncio
+import functools
+import inspect
+import random
+import time
+from collections import deque
+from typing import Any
+
+from agents import Agent, RunContextWrapper, function_tool
+from agents.tool_context import ToolContext
+
+
+class ToolTimeout(Exception):
+    """The tool did not answer within its latency policy's timeout."""
+
+
+class LatencyPolicy:
+    """Declarative latency bounds for a tool: hard timeout, hedged requests, retries with jitter.
+
+    - `timeout`: total seconds a call may take, retries and hedges included;
+      at that point the attempts are cancelled and `ToolTimeout` is raised,
+      which `@function_tool`'s `failure_error_function` turns into a fast
+      fallback answer. The bound is on the tool body: the SDK's own error
+      handling comes on top, and the first failure it formats in a process
+      costs it roughly another 0.1-0.2 s.
+    - `hedge_after`: if an attempt has not answered after this many seconds,
+      start a duplicate and take whichever finishes first. "p95" uses the
+      95th percentile of this tool's recent latencies, failed attempts and
+      timeouts included and capped at `timeout` (once `min_samples` are
+      in); None disables hedging. The delay never exceeds half of
+      `timeout`, so a hedge always has time to answer, even once p95 has
+      reached the timeout.
+    - `retries`: extra attempts after an error, waiting `backoff * 2**n`
+      seconds scaled by a random factor in [1 - jitter, 1 + jitter].
+
+    Apply it under `@function_tool`. Sync tools run in a thread, where a
+    timed-out call is abandoned rather than interrupted.
+    """
+
+    def __init__(self, timeout: float = 5.0, hedge_after: float | str | None = "p95", retries: int = 1,
+                 backoff: float = 0.1, jitter: float = 0.5, retry_on: tuple = (Exception,),
+                 min_samples: int = 20, window: int = 200):
+        self.timeout = timeout
+        self.hedge_after = hedge_after
+        self.retries = retries
+        self.backoff = backoff
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self.calls = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retried = 0
+
+    def percentile(self, fraction: float) -> float | None:
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def _hedge_delay(self) -> float | None:
+        delay = self.percentile(0.95) if self.hedge_after == "p95" else self.hedge_after
+        if delay is None:
+            return None
+        return min(delay, self.timeout / 2)
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            attempt = func
+        else:
+            async def attempt(*args, **kwargs):
+                return await asyncio.to_thread(func, *args, **kwargs)
+
+        @functools.wraps(func)
+        async def run(*args, **kwargs):
+            self.calls += 1
+            try:
+                return await asyncio.wait_for(self._call(attempt, args, kwargs), self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                self._record(self.timeout)
+                raise ToolTimeout(f"{func.__name__} did not answer within {self.timeout:g}s") from None
+
+        return run
+
+    async def _call(self, attempt, args, kwargs):
+        for n in range(self.retries + 1):
+            try:
+                return await self._hedged(attempt, args, kwargs)
+            except self.retry_on:
+                if n == self.retries:
+                    raise
+                self.retried += 1
+                delay = self.backoff * 2 ** n
+                await asyncio.sleep(delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def _record(self, seconds: float) -> None:
+        self._latencies.append(min(seconds, self.timeout))
+
+    async def _timed(self, attempt, args, kwargs):
+        # Failures count too, or a backend that errors slowly would pull p95 down.
+        # Cancelled attempts don't: a losing hedge's latency is unknown, and a
+        # timed-out call is recorded once, at the timeout, by `run`.
+        start = time.perf_counter()
+        try:
+            result = await attempt(*args, **kwargs)
+        except Exception:
+            self._record(time.perf_counter() - start)
+            raise
+        self._record(time.perf_counter() - start)
+        return result
+
+    async def _hedged(self, attempt, args, kwargs):
+        primary = asyncio.ensure_future(self._timed(attempt, args, kwargs))
+        tasks = {primary}
+        try:
+            delay = self._hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    self.hedges += 1
+                    tasks.add(asyncio.ensure_future(self._timed(attempt, args, kwargs)))
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def metrics(self) -> dict:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "retries": self.retried,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "p50_ms": round(p50 * 1e3, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1e3, 1) if p95 is not None else None,
+        }
+
+
+def lookup_fallback(context: RunContextWrapper[Any], error: Exception) -> str:
+    """Fast fallback for the model when the lookup is too slow or keeps failing."""
+    if isinstance(error, ToolTimeout):
+        return "The lookup is taking too long. Answer from what you know and offer to try again."
+    return "The lookup service is unavailable right now. Answer from what you know."
+
+
+lookup_policy = LatencyPolicy(timeout=2.0, hedge_after="p95", retries=2)
+
+
+@function_tool(failure_error_function=lookup_fallback)
+@lookup_policy
+async def delayed_lookup(query: str) -> str:
+    """Simulates a time-consuming lookup operation."""
+    roll = random.random()
+    if roll < 0.05:
+        raise ConnectionError("lookup backend reset the connection")
+    # Usually fast, sometimes stuck behind a slow backend
+    await asyncio.sleep(3 if roll > 0.92 else random.uniform(0.1, 0.3))
+    return f"Data for '{query}' retrieved successfully."
+
+
+realtime_agent = Agent(
+    name="RealtimeChatAgent",
+    instructions=(
+        "You are a highly responsive chat assistant. "
+        "Answer user questions concisely. "
+        "If the user asks for a 'delayed lookup', use the 'delayed_lookup' tool."
+    ),
+    tools=[delayed_lookup],
+)
+
+
+# Usage: 200 lookups, 10 at a time; the slowest answer is bounded by the policy's timeout
+async def main(calls: int = 200):
+    random.seed(7)
+    gate = asyncio.Semaphore(10)
+    latencies, fallbacks = [], 0
+
+    async def one(n: int):
+        nonlocal fallbacks
+        async with gate:
+            start = time.perf_counter()
+            arguments = f'{{"query": "order {n}"}}'
+            context = ToolContext(context=None, tool_name=delayed_lookup.name, tool_call_id=f"call_{n}",
+                                  tool_arguments=arguments)
+            output = await delayed_lookup.on_invoke_tool(context, arguments)
+            latencies.append(time.perf_counter() - start)
+            fallbacks += not output.startswith("Data for")
+
+    await asyncio.gather(*(one(n) for n in range(calls)))
+    latencies.sort()
+    print(f"p50 {latencies[len(latencies) // 2] * 1e3:.0f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.0f} ms, max {latencies[-1] * 1e3:.0f} ms, "
+          f"{fallbacks} fallbacks (without the policy: ~8% of calls take 3 s, ~5% fail)")
+    print(lookup_policy.metrics())
+
+if __name__ == "__main__":
+    asyncio.run(main())
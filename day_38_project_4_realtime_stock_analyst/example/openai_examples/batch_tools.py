@@ -0,0 +1,161 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from agents import Agent, function_tool
+from single_flight import call_tool
+
+
+class MicroBatcher:
+    """Turns single-key lookups made close together into one bulk upstream request.
+
+    When the model asks for AAPL, MSFT and GOOG as three tool calls in one
+    turn, the Runner starts them together; each `get()` joins the pending
+    batch, and `max_delay` seconds after the first one (or once `max_batch`
+    distinct keys are waiting) a single `fetch_many(keys)` serves them all.
+    Keys the upstream does not return resolve to None.
+    """
+
+    def __init__(self, fetch_many: Callable[[list[str]], Awaitable[dict]], max_delay: float = 0.01,
+                 max_batch: int = 50):
+        self.fetch_many = fetch_many
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._pending: dict[str, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.requested = 0
+        self.batches = 0
+        self.fetched = 0
+
+    async def get(self, key: str):
+        self.requested += 1
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.max_delay, self._flush)
+        return await asyncio.shield(future)
+
+    async def get_many(self, keys: list[str]) -> dict:
+        values = await asyncio.gather(*(self.get(key) for key in keys))
+        return dict(zip(keys, values))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._fetch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch: dict[str, asyncio.Future]) -> None:
+        self.batches += 1
+        self.fetched += len(batch)
+        try:
+            values = await self.fetch_many(list(batch))
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(values.get(key))
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            # The batch task was cancelled: its callers must not wait forever.
+            for future in batch.values():
+                if not future.done():
+                    future.cancel()
+
+    def metrics(self) -> dict:
+        return {
+            "requested": self.requested,
+            "upstream_requests": self.batches,
+            "keys_fetched": self.fetched,
+            "mean_batch_size": self.fetched / self.batches if self.batches else 0.0,
+        }
+
+
+# Simulated bulk quote API: one round trip for any number of tickers
+SIMULATED_QUOTES = {
+    "AAPL": (175.20, "75M", 0.86),
+    "MSFT": (320.50, "50M", -0.25),
+    "GOOG": (138.40, "22M", 0.41),
+}
+
+
+async def fetch_quotes(tickers: list[str]) -> dict[str, str]:
+    print(f"[API]: One request for {', '.join(tickers)}")
+    await asyncio.sleep(2)  # Simulate API call latency
+    return {
+        ticker: f"${price:.2f}, vol {volume}, {change:+.2f}%"
+        for ticker, (price, volume, change) in SIMULATED_QUOTES.items() if ticker in tickers
+    }
+
+
+quotes = MicroBatcher(fetch_quotes)
+
+
+@function_tool
+async def get_stock_quotes(tickers: list[str]) -> dict[str, str]:
+    """Fetches real-time data for several stock tickers in one call.
+
+    Args:
+        tickers: Ticker symbols to look up (e.g., ["AAPL", "MSFT", "GOOG"]).
+
+    Returns:
+        Ticker -> "price, volume, change" for each ticker, or "n/a" if unknown.
+    """
+    symbols = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers))
+    return {ticker: value or "n/a" for ticker, value in (await quotes.get_many(symbols)).items()}
+
+
+@function_tool
+async def get_realtime_stock_data(ticker: str) -> str:
+    """Fetches real-time stock data for a given ticker symbol.
+
+    Args:
+        ticker: The stock ticker symbol (e.g., "AAPL", "MSFT").
+
+    Returns:
+        A string containing real-time stock information.
+    """
+    # Single-ticker calls from the same turn are merged into one bulk request
+    ticker = ticker.strip().upper()
+    value = await quotes.get(ticker)
+    return f"Real-time data for {ticker}: {value}" if value else f"Real-time data for {ticker}: Not available."
+
+
+stock_analyst_agent = Agent(
+    name="RealtimeStockAnalyst",
+    instructions=(
+        "You are a real-time stock market analyst. "
+        "To compare several stocks, call get_stock_quotes once with all tickers; "
+        "use get_realtime_stock_data for a single ticker. "
+        "Summarize the data into a concise, actionable insight for the user."
+    ),
+    tools=[get_stock_quotes, get_realtime_stock_data],
+)
+
+
+# Usage: "compare AAPL, MSFT, GOOG" as one batch call, then as three single calls in one turn
+async def main():
+    start = time.perf_counter()
+    print(await call_tool(get_stock_quotes, '{"tickers": ["AAPL", "msft", "GOOG"]}'))
+    print(f"batch tool: {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        call_tool(get_realtime_stock_data, f'{{"ticker": "{ticker}"}}') for ticker in ("AAPL", "MSFT", "GOOG")
+    ))
+    print("\n".join(results))
+    print(f"three single calls in one turn: {time.perf_counter() - start:.1f} s")
+    print(quotes.metrics())
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,156 @@
+import asyncio
+import functools
+import inspect
+import time
+
+from agents import Agent, function_tool
+from agents.tool_context import ToolContext
+
+
+def normalize_arguments(arguments: dict) -> tuple:
+    """Default key: argument values with strings stripped and case-folded ("aapl " == "AAPL")."""
+    return tuple(sorted(
+        (name, value.strip().casefold() if isinstance(value, str) else repr(value))
+        for name, value in arguments.items()
+    ))
+
+
+class SingleFlight:
+    """Deduplicate identical in-flight tool calls: one upstream call, every caller gets its result.
+
+    While a call for a key is running, later calls with the same normalized
+    arguments wait for it instead of starting their own. With `ttl`, the
+    result is also served to calls arriving shortly after it finished.
+    Errors are shared with the waiters but never cached. The upstream call
+    runs as its own task, so a caller that gives up does not cancel it for
+    the others. Apply it under `@function_tool`.
+    """
+
+    def __init__(self, ttl: float = 0.0, key=normalize_arguments):
+        self.ttl = ttl
+        self.key = key
+        self._in_flight: dict[tuple, asyncio.Task] = {}
+        self._recent: dict[tuple, tuple[float, object]] = {}  # key -> (expires_at, result)
+        self.calls = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    def __call__(self, func):
+        signature = inspect.signature(func)
+
+        def upstream(args, kwargs):
+            if inspect.iscoroutinefunction(func):
+                return func(*args, **kwargs)
+            return asyncio.to_thread(func, *args, **kwargs)
+
+        @functools.wraps(func)
+        async def run(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__qualname__, self.key(bound.arguments))
+            self.calls += 1
+
+            recent = self._recent.get(key)
+            if recent is not None:
+                if recent[0] > time.monotonic():
+                    self.cache_hits += 1
+                    return recent[1]
+                del self._recent[key]
+
+            task = self._in_flight.get(key)
+            if task is None:
+                self.upstream_calls += 1
+                task = self._in_flight[key] = asyncio.ensure_future(upstream(args, kwargs))
+                task.add_done_callback(functools.partial(self._finished, key))
+            else:
+                self.coalesced += 1
+            return await asyncio.shield(task)
+
+        return run
+
+    def _finished(self, key: tuple, task: asyncio.Task) -> None:
+        del self._in_flight[key]
+        if self.ttl > 0 and not task.cancelled() and task.exception() is None:
+            now = time.monotonic()
+            # Every entry lives for the same ttl, so insertion order is expiry order:
+            # drop expired entries from the front so keys never asked again don't pile up.
+            while self._recent:
+                oldest = next(iter(self._recent))
+                if self._recent[oldest][0] > now:
+                    break
+                del self._recent[oldest]
+            self._recent.pop(key, None)
+            self._recent[key] = (now + self.ttl, task.result())
+
+    def metrics(self) -> dict:
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            # share of calls that did not reach the upstream API
+            "coalescing_ratio": 1 - self.upstream_calls / self.calls if self.calls else 0.0,
+            "in_flight": len(self._in_flight),
+            "cached": len(self._recent),
+        }
+
+
+stock_quotes = SingleFlight(ttl=1.0)  # a quote may be up to 1 s old
+
+
+@function_tool
+@stock_quotes
+async def get_realtime_stock_data(ticker: str) -> str:
+    """Fetches real-time stock data for a given ticker symbol.
+
+    Args:
+        ticker: The stock ticker symbol (e.g., "AAPL", "MSFT").
+
+    Returns:
+        A string containing real-time stock information.
+    """
+    print(f"[TOOL]: Fetching real-time data for {ticker.upper()}...")
+    await asyncio.sleep(2)  # Simulate API call latency
+
+    # Simulated data
+    ticker_upper = ticker.strip().upper()
+    if ticker_upper == "AAPL":
+        return f"Real-time data for AAPL: Price $175.20, Volume 75M, Change +$1.50 (+0.86%)."
+    elif ticker_upper == "MSFT":
+        return f"Real-time data for MSFT: Price $320.50, Volume 50M, Change -$0.80 (-0.25%)."
+    else:
+        return f"Real-time data for {ticker_upper}: Not available or invalid ticker."
+
+
+stock_analyst_agent = Agent(
+    name="RealtimeStockAnalyst",
+    instructions=(
+        "You are a real-time stock market analyst. "
+        "Use the 'get_realtime_stock_data' tool to fetch current prices and metrics. "
+        "Summarize the data into a concise, actionable insight for the user."
+    ),
+    tools=[get_realtime_stock_data],
+)
+
+
+def call_tool(tool, arguments: str):
+    """Fire one tool call without a model, as each concurrent agent run would."""
+    context = ToolContext(context=None, tool_name=tool.name, tool_call_id=f"call_{tool.name}",
+                          tool_arguments=arguments)
+    return tool.on_invoke_tool(context, arguments)
+
+
+# Usage: 100 users asking about AAPL (and a few about MSFT) at the same moment
+async def main():
+    tickers = ["AAPL", "aapl", " AAPL", "MSFT"] * 25
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        call_tool(get_realtime_stock_data, f'{{"ticker": "{ticker}"}}') for ticker in tickers
+    ))
+    print(f"{len(results)} calls answered in {time.perf_counter() - start:.1f} s")
+    await call_tool(get_realtime_stock_data, '{"ticker": "AAPL"}')  # a moment later: from the TTL cache
+    print(stock_quotes.metrics())
+
+if __name__ == "__main__":
+    asyncio.run(main())